@@ -12,12 +12,15 @@ AUTO_SEQUENCE = "__auto_sequence__"
 
 MIXIN_MODULE = "ome_types._mixins"
 # class_name, import_string, whether-to-prepend or append to the existing Bases
+# (mixins that subclass OMEType must be prepended, to come before it in the MRO)
 MIXINS: list[tuple[str, str, bool]] = [
     (".*", f"{MIXIN_MODULE}._base_type.OMEType", False),  # base type on every class
     ("OME", f"{MIXIN_MODULE}._ome.OMEMixin", True),
     ("Instrument", f"{MIXIN_MODULE}._instrument.InstrumentMixin", False),
     ("Reference", f"{MIXIN_MODULE}._reference.ReferenceMixin", True),
     ("Map", f"{MIXIN_MODULE}._map_mixin.MapMixin", False),
+    ("Pixels", f"{MIXIN_MODULE}._pixels.PixelsMixin", True),
+    ("BinData", f"{MIXIN_MODULE}._bin_data.BinDataMixin", True),
     ("Union", f"{MIXIN_MODULE}._collections.ShapeUnionMixin", True),
     (
         "StructuredAnnotations",
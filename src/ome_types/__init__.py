@@ -11,19 +11,49 @@ if TYPE_CHECKING:
     from ome_types.units import ureg
 
 from ome_types import model
-from ome_types._conversion import from_tiff, from_xml, to_dict, to_xml, validate_xml
+from ome_types._conversion import (
+    OMEParser,
+    OMESerializer,
+    TiffResult,
+    TiffSet,
+    clear_schema_cache,
+    from_tiff,
+    from_tiff_set,
+    from_tiffs,
+    from_xml,
+    iter_elements,
+    iter_images,
+    precompile_transforms,
+    to_dict,
+    to_xml,
+    update_tiff_xml,
+    validate_xml,
+    write_xml,
+)
 from ome_types.model import OME
 
 __all__ = [
     "OME",
+    "OMEParser",
+    "OMESerializer",
+    "TiffResult",
+    "TiffSet",
     "__version__",
+    "clear_schema_cache",
     "from_tiff",
+    "from_tiff_set",
+    "from_tiffs",
     "from_xml",
+    "iter_elements",
+    "iter_images",
     "model",
+    "precompile_transforms",
     "to_dict",
     "to_xml",
+    "update_tiff_xml",
     "ureg",
     "validate_xml",
+    "write_xml",
 ]
 
 
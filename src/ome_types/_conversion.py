@@ -1,20 +1,48 @@
 from __future__ import annotations
 
+import copy
+import gzip
+import hashlib
 import io
-import operator
+import mmap
+import multiprocessing
 import os
+import re
+import threading
 import warnings
-from contextlib import nullcontext, suppress
-from functools import cache
+import weakref
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import ExitStack, contextmanager, suppress
+from functools import cache, partial
 from pathlib import Path
-from struct import Struct
-from typing import TYPE_CHECKING, Callable, cast, overload
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    NamedTuple,
+    TypeVar,
+    cast,
+    get_args,
+    overload,
+)
 
 from pydantic import BaseModel
 from xsdata.formats.dataclass.parsers.config import ParserConfig
 
+from ome_types._mixins._bin_data import BinDataMixin, LazyValue
+from ome_types._mixins._ids import current_id_context, id_scope
+from ome_types._mixins._pixels import PixelsMixin
+from ome_types._mixins._tracking import track_lists
+from ome_types._tiff import TIFF_TYPES, TiffHeader, write_description
+from ome_types._writer import CanonicalXmlWriter, StreamingXmlWriter
 from xsdata_pydantic_basemodel.bindings import (
     SerializerConfig,
+    XmlContext,
     XmlParser,
     XmlSerializer,
 )
@@ -26,24 +54,25 @@ except ImportError:  # pragma: no cover
 
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
-    from contextlib import AbstractContextManager
-    from typing import Any, BinaryIO, Literal, TypedDict
+    from collections.abc import Iterable, Iterator
+    from typing import Any, BinaryIO, Literal, TextIO, TypedDict
     from xml.etree import ElementTree
 
     import xmlschema
-    from lxml.etree import _XSLTResultTree
+    from lxml.etree import XSLT, _XSLTResultTree
+    from xsdata.formats.dataclass.models.elements import XmlMeta, XmlVar
     from xsdata.formats.dataclass.parsers.mixins import XmlHandler
 
     from ome_types._mixins._base_type import OMEType
-    from ome_types.model import OME
-    from xsdata_pydantic_basemodel.bindings import XmlContext
+    from ome_types._mixins._ome import Referrer
+    from ome_types.model import OME, Image
 
     AnyElement = ET._Element | ElementTree.Element
     AnyElementTree = ElementTree.ElementTree | ET._ElementTree
     ElementOrTree = AnyElement | AnyElementTree
     TransformationCallable = Callable[[AnyElementTree], AnyElementTree]
     XMLSource = Path | str | bytes | BinaryIO
+    XMLDest = str | os.PathLike | TextIO | BinaryIO
     FileLike = str | io.BufferedIOBase
 
     class ParserKwargs(TypedDict, total=False):
@@ -51,8 +80,31 @@ if TYPE_CHECKING:
         context: XmlContext
         handler: type[XmlHandler]
 
+    class SerializerKwargs(TypedDict, total=False):
+        context: XmlContext
+
 
-__all__ = ["from_tiff", "from_xml", "tiff2xml", "to_dict", "to_xml"]
+__all__ = [
+    "OMEParser",
+    "OMESerializer",
+    "TiffResult",
+    "TiffSet",
+    "clear_schema_cache",
+    "from_tiff",
+    "from_tiff_set",
+    "from_tiffs",
+    "from_xml",
+    "iter_elements",
+    "iter_images",
+    "precompile_transforms",
+    "tiff2xml",
+    "to_dict",
+    "to_xml",
+    "update_tiff_xml",
+    "write_xml",
+]
+
+T = TypeVar("T", bound="OMEType")
 
 OME_ROOT = "http://www.openmicroscopy.org/Schemas/OME"
 OME_2016_06_URI = f"{OME_ROOT}/2016-06"
@@ -68,6 +120,10 @@ def from_xml(
     parser_kwargs: ParserKwargs | None = None,
     transformations: Iterable[TransformationCallable] = (),
     warn_on_schema_update: bool = False,
+    streaming: bool = False,
+    trust: bool = False,
+    plane_table: bool = False,
+    bin_data: Literal["eager", "lazy", "skip"] = "eager",
 ) -> OME:  #  Not totally true, see note below
     """Generate an OME object from an XML document.
 
@@ -91,7 +147,7 @@ def from_xml(
         Ignored, but kept for backwards compatibility.
     parser_kwargs : ParserKwargs | None
         Passed to the XmlParser constructor. If None, a default parser
-        will be used.
+        (sharing a process-wide `XmlContext`) will be used.
     transformations: Iterable[TransformationCallable]
         A sequence of functions that take an ElementTree and return an ElementTree.
         These will be applied sequentially to the XML document before parsing.
@@ -100,6 +156,36 @@ def from_xml(
     warn_on_schema_update : bool
         Whether to warn if a transformation was applied to bring the document to
         OME-2016-06.
+    streaming : bool
+        If True, the document is parsed incrementally with `iterparse`, and each
+        element is discarded as soon as it has been bound to the model, rather than
+        first building a full ElementTree.  This keeps peak memory close to the size
+        of the resulting model.  Cannot be combined with `validate` or
+        `transformations` (both of which require a full tree).  Documents in older
+        OME namespaces are still upgraded in memory before parsing.
+    trust : bool
+        If True, models are built with `model_construct`, bypassing pydantic
+        validation.  Only the coercions that pydantic would otherwise perform on
+        parsed XML (model validators and ID normalization) are applied, so the result
+        is equal to that of the validated path.  This is much faster, but should only
+        be used for documents known to be valid (e.g. with `validate=True`, or from a
+        trusted source): invalid values will end up in the model unchecked.  Ignored
+        if `parser_kwargs` provides a `config`.
+    plane_table : bool
+        If True, the planes of each `Pixels` are parsed directly into a columnar
+        `PlaneTable` (available as `Pixels.plane_table`), without creating a `Plane`
+        model for each of them, and `Pixels.planes` is left empty.  `to_xml` writes
+        the planes back out from the table.  Pixels with planes that have a
+        `hash_sha1` or `annotation_refs` are parsed as usual.  Requires NumPy.
+    bin_data : Literal["eager", "lazy", "skip"]
+        How to handle the (base64) payload of `<BinData>` elements, which can make up
+        most of documents with embedded pixels.  With "eager" (the default), it is
+        decoded into `BinData.value`.  Otherwise, it is cut out of the document
+        before parsing, leaving `value` empty (all attributes are kept): with
+        "skip" it is dropped, while with "lazy" its location is recorded, so that
+        `BinData.load_value()` and `BinData.as_array()` can read it from the source
+        on demand (memory-mapped, if the source is a path; otherwise the source
+        is kept in memory).  `to_xml` writes lazy payloads back out.
 
     Returns
     -------
@@ -114,6 +200,40 @@ def from_xml(
             DeprecationWarning,
             stacklevel=2,
         )
+    if trust:
+        parser_kwargs = {"config": _TRUSTED_CONFIG, **(parser_kwargs or {})}
+    if plane_table:
+        parser_kwargs = _with_class_factory(parser_kwargs, _plane_table_factory)
+    if bin_data != "eager":
+        if bin_data not in ("lazy", "skip"):
+            raise ValueError(
+                f"bin_data must be 'eager', 'lazy' or 'skip', not {bin_data!r}"
+            )
+        source, values = _strip_bin_data(source, lazy=bin_data == "lazy")
+        parser_kwargs = _with_class_factory(
+            parser_kwargs, lambda base: _bin_data_factory(base, values)
+        )
+
+    if streaming:
+        if validate or transformations:
+            raise ValueError(
+                "streaming=True cannot be combined with `validate` or "
+                "`transformations`, which require a full ElementTree."
+            )
+        # hand the (possibly upgraded) file-like source straight to the parser,
+        # whose handler will iterparse it, rather than building a tree first.
+        prolog = _sniff_source(source)
+        upgraded = _upgrade_2016(prolog, warn_on_schema_update, as_tree=False)
+        # (the stream is ours to close, once parsed)
+        with cast("BinaryIO", upgraded) as source_2016:
+            OME_type = _ome_type_for_tag(prolog.root_tag)
+            kwargs: ParserKwargs = {
+                "handler": _streaming_handler(),
+                **_parser_kwargs(parser_kwargs),
+            }
+            parser = XmlParser(**kwargs)
+            with id_scope():
+                return parser.parse(source_2016, OME_type)
 
     if validate:
         xml_2016 = validate_xml(source, warn_on_schema_update=warn_on_schema_update)
@@ -130,8 +250,528 @@ def from_xml(
             warnings.warn("Transformation returned None, skipping", stacklevel=2)
 
     OME_type = _get_root_ome_type(xml_2016)
-    parser = XmlParser(**(parser_kwargs or {}))
-    return parser.parse(xml_2016, OME_type)
+    parser = XmlParser(**_parser_kwargs(parser_kwargs))
+    with id_scope():
+        return parser.parse(xml_2016, OME_type)
+
+
+def _parser_kwargs(parser_kwargs: ParserKwargs | None) -> ParserKwargs:
+    """Fill in the default (shared) context, unless one was provided."""
+    return {"context": _DEFAULT_PARSER.context, **(parser_kwargs or {})}
+
+
+class _ConstructPlan(NamedTuple):
+    """Precomputed recipe for building one model class without validation."""
+
+    model_validators: tuple[Callable[[dict], dict], ...]
+    # (name, default, default_factory, field validators), in field order
+    fields: tuple[tuple[str, Any, Callable[[], Any] | None, tuple[Callable, ...]], ...]
+    private: dict[str, Any] | None
+    is_ome: bool
+
+
+@cache
+def _construct_plan(cls: type[BaseModel]) -> _ConstructPlan | None:
+    from ome_types._mixins._base_type import OMEType
+    from ome_types._mixins._ome import OMEMixin
+
+    if not issubclass(cls, OMEType):
+        return None
+
+    decorators = cls.__pydantic_decorators__
+    model_validators = tuple(
+        d.func for d in decorators.model_validators.values() if d.info.mode == "before"
+    )
+    by_field: dict[str, list[Callable]] = {}
+    # "before" validators run before "after" validators, whatever their order
+    for mode in ("before", "after"):
+        for d in decorators.field_validators.values():
+            if d.info.mode == mode:
+                for name in d.info.fields:
+                    by_field.setdefault(name, []).append(d.func)
+    # OMEType sets `validate_default`, so validators also run on defaults
+    # (this is what assigns ids to objects that were parsed without one)
+    fields = tuple(
+        (name, f.default, f.default_factory, tuple(by_field.get(name, ())))
+        for name, f in cls.model_fields.items()
+    )
+    private = {k: v.get_default() for k, v in cls.__private_attributes__.items()}
+    return _ConstructPlan(
+        model_validators,
+        fields,  # type: ignore[arg-type]  # our default factories take no data
+        private or None,
+        issubclass(cls, OMEMixin),
+    )
+
+
+def _trusted_factory(cls: type[BaseModel], params: dict[str, Any]) -> Any:
+    """Build a model without pydantic validation (an xsdata `class_factory`).
+
+    xsdata has already converted every value to its annotated type (enums,
+    datetimes, `Color`, numbers, ...), so all that is left to do is to run the
+    model's own validators, which normalize ids and reshape some fields.  The
+    instance is then assembled the way `BaseModel.model_construct` does it, but
+    with defaults that were looked up once per class.
+    """
+    if (plan := _construct_plan(cls)) is None:
+        return cls(**params)
+
+    for validator in plan.model_validators:
+        params = validator(params)
+    values: dict[str, Any] = {}
+    for name, default, factory, validators in plan.fields:
+        if name in params:
+            value = params[name]
+        else:
+            value = default if factory is None else factory()
+        for validator in validators:
+            value = validator(value)
+        values[name] = value
+
+    obj = cls.__new__(cls)
+    object.__setattr__(obj, "__dict__", values)
+    object.__setattr__(obj, "__pydantic_fields_set__", set(params))
+    object.__setattr__(obj, "__pydantic_extra__", None)
+    private = None if plan.private is None else dict(plan.private)
+    object.__setattr__(obj, "__pydantic_private__", private)
+    track_lists(obj)
+    if plan.is_ome:
+        obj._link_refs()  # type: ignore[attr-defined]
+    return obj
+
+
+_TRUSTED_CONFIG = ParserConfig(class_factory=_trusted_factory)  # type: ignore[arg-type]
+
+
+def _with_class_factory(
+    parser_kwargs: ParserKwargs | None,
+    wrap: Callable[[Callable[[type, dict], Any]], Callable[[type, dict], Any]],
+) -> ParserKwargs:
+    """Wrap the `class_factory` of the parser config (or of a default config)."""
+    kwargs: ParserKwargs = {**(parser_kwargs or {})}
+    config = copy.copy(kwargs.get("config") or ParserConfig())
+    config.class_factory = wrap(config.class_factory)
+    kwargs["config"] = config
+    return kwargs
+
+
+def _plane_table_factory(
+    base_factory: Callable[[type, dict], Any],
+) -> Callable[[type, dict], Any]:
+    """Wrap a `class_factory` to collect the planes of each `Pixels` in a table."""
+    from ome_types.model import Pixels, Plane
+    from ome_types.model._plane_table import PlaneTable
+
+    def class_factory(cls: type[Any], params: dict[str, Any]) -> Any:
+        if cls is Plane:
+            if not (params.get("hash_sha1") or params.get("annotation_refs")):
+                # keep the raw fields, for the parent Pixels to put in its table
+                return params
+        elif cls is Pixels and (planes := params.get("planes")):
+            if all(isinstance(p, dict) for p in planes):
+                del params["planes"]
+                pixels = base_factory(cls, params)
+                pixels.plane_table = PlaneTable.from_planes(planes)
+                return pixels
+            # some planes can't go in a table: build them all as models
+            params["planes"] = [
+                base_factory(Plane, p) if isinstance(p, dict) else p for p in planes
+            ]
+        return base_factory(cls, params)
+
+    return class_factory
+
+
+def _bin_data_factory(
+    base_factory: Callable[[type, dict], Any], values: Iterable[LazyValue | None]
+) -> Callable[[type, dict], Any]:
+    """Wrap a `class_factory` to give each `BinData` its (lazy) value, in order."""
+    from ome_types.model import BinData
+
+    pending = iter(values)
+
+    def class_factory(cls: type[Any], params: dict[str, Any]) -> Any:
+        if cls is not BinData:
+            return base_factory(cls, params)
+        params["value"] = b""
+        bin_data = base_factory(cls, params)
+        bin_data._lazy_value = next(pending, None)
+        return bin_data
+
+    return class_factory
+
+
+# the namespaces of the OME schemas (BinData is in the BinaryFile namespace before
+# 2016-06)
+_OME_SCHEMAS = "http://www.openmicroscopy.org/Schemas/"
+# a start tag (attribute values may contain ">")
+_START_TAG = re.compile(rb"""<[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>""")
+# size of the chunks that documents are scanned in
+_SCAN_CHUNK = 1 << 22
+
+
+def _strip_bin_data(
+    source: XMLSource, lazy: bool
+) -> tuple[bytes, list[LazyValue | None]]:
+    """Cut the payload of all `<BinData>` elements out of an XML document.
+
+    Returns the document without the payloads and, for each BinData in document
+    order, the location of its payload in `source` (if `lazy`; None otherwise).
+    Files are memory-mapped, so that payloads are never read into memory.
+    """
+    normalized = _normalize(source)
+    with ExitStack() as stack:
+        if isinstance(normalized, str):
+            fh = stack.enter_context(open(normalized, "rb"))
+            if os.fstat(fh.fileno()).st_size:
+                mmap_ = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                buf: bytes | mmap.mmap = stack.enter_context(mmap_)
+            else:
+                buf = b""
+            origin: Path | bytes = Path(normalized)
+        else:
+            buf = origin = normalized.read()
+
+        pieces: list[bytes] = []
+        values: list[LazyValue | None] = []
+        copied = 0
+        for payload in _bin_data_payloads(buf):
+            if payload is None:
+                values.append(None)
+                continue
+            start, stop = payload
+            pieces.append(buf[copied:start])
+            values.append(LazyValue(origin, start, stop) if lazy else None)
+            copied = stop
+        pieces.append(buf[copied:])
+    return b"".join(pieces), values
+
+
+def _bin_data_payloads(buf: bytes | mmap.mmap) -> list[tuple[int, int] | None]:
+    """Return the (byte) range of the payload of each `BinData` of a document.
+
+    The document is scanned with expat, so that only actual elements of the OME
+    schemas are found (the ones that are parsed into `BinData` objects), and not
+    those in comments, in CDATA sections, or in other namespaces (e.g. in the
+    value of an `XMLAnnotation`).  None for empty elements.
+    """
+    from xml.parsers import expat
+
+    payloads: list[tuple[int, int] | None] = []
+    parser = expat.ParserCreate(namespace_separator=" ")
+    # the start of the payload of the BinData being scanned, if not empty
+    payload_start: int | None = None
+
+    def _start(name: str, attrs: Any) -> None:
+        nonlocal payload_start
+        uri, _, tag = name.rpartition(" ")
+        if tag == "BinData" and uri.startswith(_OME_SCHEMAS):
+            match = _START_TAG.match(buf, parser.CurrentByteIndex)
+            if match is None or match.group().endswith(b"/>"):
+                payloads.append(None)
+            else:
+                payload_start = match.end()
+
+    def _end(name: str) -> None:
+        nonlocal payload_start
+        if payload_start is not None and name.endswith(" BinData"):
+            payloads.append((payload_start, parser.CurrentByteIndex))
+            payload_start = None
+
+    parser.StartElementHandler = _start
+    parser.EndElementHandler = _end
+    try:
+        for pos in range(0, len(buf), _SCAN_CHUNK):
+            parser.Parse(buf[pos : pos + _SCAN_CHUNK], False)
+        parser.Parse(b"", True)
+    except expat.ExpatError:
+        # malformed: leave it to the XML parser to complain
+        pass
+    return payloads
+
+
+class OMEParser:
+    """Reusable parser for OME-XML documents.
+
+    An `OMEParser` holds an xsdata `XmlContext`, which caches the binding metadata
+    for each model class as it is first encountered.  Reusing one parser for many
+    documents avoids rebuilding that metadata for each of them, which dominates the
+    cost of parsing small documents.  `from_xml` uses a module-level default
+    instance.
+
+    Instances are thread-safe: each parse uses its own xsdata `XmlParser`, and
+    only the context is shared.
+
+    Parameters
+    ----------
+    config : ParserConfig | None
+        xsdata parser configuration to use for each parse.
+    context : XmlContext | None
+        The context to use.  If None, a new context is created.
+    """
+
+    def __init__(
+        self, config: ParserConfig | None = None, context: XmlContext | None = None
+    ) -> None:
+        self.config = config
+        self.context = context if context is not None else XmlContext()
+
+    def from_xml(
+        self,
+        source: XMLSource,
+        *,
+        parser_kwargs: ParserKwargs | None = None,
+        **kwargs: Any,
+    ) -> OME:
+        """Generate an OME object from an XML document, using this parser.
+
+        See docstring of [`ome_types.from_xml`][] for kwargs.
+        """
+        _kwargs: ParserKwargs = {"context": self.context}
+        if self.config is not None:
+            _kwargs["config"] = self.config
+        _kwargs.update(parser_kwargs or {})
+        return from_xml(source, parser_kwargs=_kwargs, **kwargs)
+
+
+class OMESerializer:
+    """Reusable serializer for ome-types objects.
+
+    The counterpart to `OMEParser`: holds an xsdata `XmlContext` that caches the
+    binding metadata for each model class, so that it is only built once.  `to_xml`
+    uses a module-level default instance, which shares its context with the default
+    `OMEParser`.  Instances are thread-safe.
+
+    Parameters
+    ----------
+    context : XmlContext | None
+        The context to use.  If None, a new context is created.
+    """
+
+    def __init__(self, context: XmlContext | None = None) -> None:
+        self.context = context if context is not None else XmlContext()
+
+    def to_xml(
+        self,
+        obj: OMEType,
+        *,
+        serializer_kwargs: SerializerKwargs | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """Generate an XML document from an OME object, using this serializer.
+
+        See docstring of [`ome_types.to_xml`][] for kwargs.
+        """
+        _kwargs: SerializerKwargs = {"context": self.context}
+        _kwargs.update(serializer_kwargs or {})
+        return to_xml(obj, serializer_kwargs=_kwargs, **kwargs)
+
+
+_DEFAULT_PARSER = OMEParser()
+_DEFAULT_SERIALIZER = OMESerializer(_DEFAULT_PARSER.context)
+
+
+def _release_consumed(
+    context: Iterable[tuple[str, Any]],
+) -> Iterator[tuple[str, Any]]:
+    """Pass through iterparse events, dropping elements once they've been consumed.
+
+    xsdata's handlers already `clear()` each element on its "end" event, but the
+    (empty) element remains attached to its parent, so the tree still grows with the
+    document.  Here we also detach all previously-ended siblings, so that only the
+    current path from the root is kept in memory.
+    """
+    stack: list[Any] = []
+    for event, element in context:
+        yield event, element
+        if event == "start":
+            stack.append(element)
+        elif event == "end":
+            stack.pop()
+            if stack:
+                del stack[-1][:-1]
+
+
+@cache
+def _streaming_handler() -> type[XmlHandler]:
+    """Return an xsdata XmlHandler that releases elements while parsing."""
+    from xsdata.formats.dataclass.parsers.handlers import default_handler
+
+    class StreamingEventHandler(default_handler()):  # type: ignore[misc]
+        def process_context(self, context: Iterable[tuple[str, Any]]) -> Any:
+            return super().process_context(_release_consumed(context))
+
+    return StreamingEventHandler
+
+
+# ------------------------
+
+
+@overload
+def iter_elements(
+    source: XMLSource,
+    types: type[T],
+    *,
+    parser_kwargs: ParserKwargs | None = ...,
+    warn_on_schema_update: bool = ...,
+) -> Iterator[T]: ...
+
+
+@overload
+def iter_elements(
+    source: XMLSource,
+    types: Any,
+    *,
+    parser_kwargs: ParserKwargs | None = ...,
+    warn_on_schema_update: bool = ...,
+) -> Iterator[OMEType]: ...
+
+
+def iter_elements(
+    source: XMLSource,
+    types: Any,
+    *,
+    parser_kwargs: ParserKwargs | None = None,
+    warn_on_schema_update: bool = False,
+) -> Iterator[OMEType]:
+    """Incrementally yield top-level elements of an OME document as models.
+
+    Rather than building the full `OME` object, the document is read with
+    `iterparse`, and each top-level element of the requested type(s) (i.e. direct
+    children of the root `<OME>` element) is parsed, validated, and yielded as soon
+    as it ends.  Its XML is then discarded, so memory use scales with the size of one
+    element rather than the whole document.
+
+    All other top-level elements (Instruments, StructuredAnnotations, ROIs, etc.) are
+    parsed and kept, so that references in the yielded objects can be resolved.
+    Because those elements may appear *after* the yielded one in the document,
+    references are resolved lazily: `ref.ref` looks up the target at access time, and
+    returns `None` if the target has not (yet) been parsed, or is itself one of the
+    streamed types.
+
+    Parameters
+    ----------
+    source : Path | str | bytes | io.BytesIO
+        Path to an XML file, string or bytes containing XML, or a file-like object.
+    types : type[OMEType] | tuple[type[OMEType], ...]
+        The model class(es) to yield. May be a single class, a tuple of classes, or a
+        union (e.g. `model.Image | model.Plate`). Each must be the type of a direct
+        child element of `<OME>`.
+    parser_kwargs : ParserKwargs | None
+        Passed to the XmlParser constructor. If None, a default parser
+        will be used.
+    warn_on_schema_update : bool
+        Whether to warn if a transformation was applied to bring the document to
+        OME-2016-06.
+
+    Yields
+    ------
+    OMEType
+        Instances of the requested types, in document order.
+    """
+    from ome_types._mixins._ome import collect_ids_and_references
+    from ome_types.model import OME
+
+    wanted = set(get_args(types) or (types if isinstance(types, tuple) else (types,)))
+    parser = XmlParser(**_parser_kwargs(parser_kwargs))
+    meta = parser.context.build(OME)
+    top_level = {tp: var.qname for var in meta.get_element_vars() for tp in var.types}
+    if unknown := wanted - set(top_level):
+        names = ", ".join(getattr(t, "__name__", repr(t)) for t in unknown)
+        raise ValueError(f"Not top-level elements of an OME document: {names}")
+    tag_types = {qname: tp for tp, qname in top_level.items()}
+
+    # IDs are converted (and numbered) per document, as they are in from_xml.
+    # (The context is only active while parsing, not while the caller has control.)
+    parent_ids = current_id_context()
+    id_context = parent_ids.new_document()
+    shared_ids: dict[str, OMEType] = {}
+    upgraded = _upgrade_2016(
+        _sniff_source(source), warn_on_schema_update, as_tree=False
+    )
+    # (closed along with this generator, also if the caller stops early)
+    with cast("BinaryIO", upgraded) as xml_2016:
+        root = None
+        depth = 0
+        for event, elem in ET.iterparse(xml_2016, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1 or root is None:
+                continue
+            if (tp := tag_types.get(str(elem.tag))) is not None:
+                with id_context.active():
+                    obj = parser.parse(elem, tp)
+                parent_ids.update(id_context)
+                ids, references = collect_ids_and_references(obj)
+                if tp in wanted:
+                    _link_lazy_refs(references, ids, shared_ids)
+                    yield obj
+                else:
+                    # everything else is retained, to serve as reference targets
+                    shared_ids.update(ids)
+                    _link_lazy_refs(references, {}, shared_ids)
+            root.remove(elem)
+
+
+def iter_images(
+    source: XMLSource,
+    *,
+    parser_kwargs: ParserKwargs | None = None,
+    warn_on_schema_update: bool = False,
+) -> Iterator[Image]:
+    """Incrementally yield `Image` models from an OME document.
+
+    Shortcut for `iter_elements(source, model.Image)`. See
+    [`ome_types._conversion.iter_elements`][] for details.
+    """
+    from ome_types.model import Image
+
+    return iter_elements(
+        source,
+        Image,
+        parser_kwargs=parser_kwargs,
+        warn_on_schema_update=warn_on_schema_update,
+    )
+
+
+class _LazyRef:
+    """Stand-in for `weakref.ref` that looks up its target at call time."""
+
+    __slots__ = ("id", "index")
+
+    def __init__(self, index: dict[str, OMEType], id: str) -> None:
+        self.index = index
+        self.id = id
+
+    def __call__(self) -> OMEType | None:
+        return self.index.get(self.id)
+
+    def __eq__(self, other: object) -> bool:
+        # mimic weakref.ref, which compares equal if the referents are equal
+        if isinstance(other, (_LazyRef, weakref.ReferenceType)):
+            return bool(self() == other())
+        return NotImplemented
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> _LazyRef:
+        # the index is shared state; it should never be copied along with a model
+        return self
+
+
+def _link_lazy_refs(
+    references: list[Referrer],
+    local_ids: dict[str, OMEType],
+    shared_ids: dict[str, OMEType],
+) -> None:
+    """Link `references` of an object, preferring targets within the object itself."""
+    for ref, _ in references:
+        if ref.id in local_ids:
+            ref._ref = weakref.ref(local_ids[ref.id])
+        else:
+            ref._ref = _LazyRef(shared_ids, ref.id)  # type: ignore[assignment]
 
 
 # ------------------------
@@ -161,55 +801,292 @@ def from_tiff(
     return from_xml(xml, validate=validate, parser_kwargs=parser_kwargs)
 
 
-TIFF_TYPES: dict[bytes, tuple[Struct, Struct, int, Struct]] = {
-    b"II*\0": (Struct("<I"), Struct("<H"), 12, Struct("<H")),
-    b"MM\0*": (Struct(">I"), Struct(">H"), 12, Struct(">H")),
-    b"II+\0": (Struct("<Q"), Struct("<Q"), 20, Struct("<H")),
-    b"MM\0+": (Struct(">Q"), Struct(">Q"), 20, Struct(">H")),
-}
+class TiffSet(NamedTuple):
+    """The metadata of a multi-file OME-TIFF, returned by `from_tiff_set`."""
+
+    # the authoritative metadata of the whole set
+    ome: OME
+    # UUID -> path of each file of the set (that has a known file name)
+    files: dict[str, Path]
+
+
+def from_tiff_set(
+    path: Path | str,
+    *,
+    validate: bool | None = None,
+    parser_kwargs: ParserKwargs | None = None,
+    cache: dict[str, TiffSet] | None = None,
+) -> TiffSet:
+    """Read the metadata of the multi-file OME-TIFF that `path` belongs to.
+
+    In a multi-file OME-TIFF, each file either carries the full OME-XML, or a
+    `BinaryOnly` element pointing to the file that does (e.g. a `.companion.ome`).
+    This follows that pointer, so that a single `OME` object is returned for any
+    file of the set, along with the paths of all files of the set (from the
+    `file_name` of `TiffData.UUID`, relative to the metadata file).
 
+    Parameters
+    ----------
+    path : Path | str
+        Path to any TIFF file of the set.
+    validate : bool | None
+        Passed to `from_xml`.
+    parser_kwargs : ParserKwargs | None
+        Passed to `from_xml`.
+    cache : dict[str, TiffSet] | None
+        If given, results are stored in (and looked up from) this dict, keyed by
+        the UUID of the metadata file and of every file of the set.  Passing the
+        same dict when reading each file of a set means that the metadata is only
+        read and parsed once.  Only the root element of each file's OME-XML is read
+        to look it up.
 
-def _unpack(fh: BinaryIO, strct: Struct) -> int:
-    return strct.unpack(fh.read(strct.size))[0]
+    Returns
+    -------
+    TiffSet
+        The `OME` object of the set, and a map of the UUID of each file to its path.
+    """
+    path = Path(path)
+    xml = tiff2xml(path)
+    root_uuid, binary_only = _sniff_binary_only(xml)
+    key = binary_only[1] if binary_only else root_uuid
+    if cache is not None and key in cache:
+        return cache[key]
+
+    # the file holding the metadata, which file names are relative to
+    metadata_path = path
+    source: bytes | Path = xml
+    if binary_only is not None:
+        # the metadata is in another file: a companion XML file, or another TIFF
+        metadata_path = source = path.parent / binary_only[0]
+        with open(source, "rb") as fh:
+            if fh.read(4) in TIFF_TYPES:
+                source = tiff2xml(source)
+    ome = from_xml(source, validate=validate, parser_kwargs=parser_kwargs)
+
+    files: dict[str, Path] = {}
+    if ome.uuid and isinstance(source, bytes):
+        files[ome.uuid] = metadata_path
+    for image in ome.images:
+        for tiff_data in image.pixels.tiff_data_blocks:
+            if (uuid := tiff_data.uuid) is not None and uuid.file_name:
+                files[uuid.value] = metadata_path.parent / uuid.file_name
+
+    result = TiffSet(ome, files)
+    if cache is not None:
+        for uuid_key in (key, ome.uuid, *files):
+            if uuid_key:
+                cache[uuid_key] = result
+    return result
+
+
+def _sniff_binary_only(xml: bytes) -> tuple[str | None, tuple[str, str] | None]:
+    """Return the root UUID, and (MetadataFile, UUID) of BinaryOnly, if present.
+
+    Only the start of the document is parsed: BinaryOnly can only be preceded by
+    Rights in the OME element.
+    """
+    pull_parser = ET.XMLPullParser(events=("start", "end"))
+    root_uuid = None
+    depth = 0
+    for start in range(0, len(xml), _SNIFF_CHUNK):
+        pull_parser.feed(xml[start : start + _SNIFF_CHUNK])
+        for event, elem in pull_parser.read_events():
+            if event == "end":
+                depth -= 1
+                continue
+            depth += 1
+            if depth == 1:
+                root_uuid = elem.get("UUID")
+            elif depth == 2:
+                name = str(elem.tag).rpartition("}")[2]
+                if name == "BinaryOnly":
+                    return root_uuid, (
+                        elem.get("MetadataFile", ""),
+                        elem.get("UUID", ""),
+                    )
+                if name != "Rights":
+                    return root_uuid, None
+    return root_uuid, None
+
+
+class TiffResult(NamedTuple):
+    """Result of reading the metadata of one file, in `from_tiffs`."""
+
+    path: Path | str
+    # None if reading or parsing the file failed
+    ome: OME | None
+    error: Exception | None = None
+
+
+def from_tiffs(
+    paths: Iterable[Path | str],
+    *,
+    workers: int | None = None,
+    executor: Literal["thread", "process"] = "thread",
+    ordered: bool = True,
+    validate: bool | None = None,
+    parser_kwargs: ParserKwargs | None = None,
+) -> Iterator[TiffResult]:
+    """Read the OME metadata of many TIFF files, in parallel.
 
+    The headers of the files are read on a thread pool, and each OME-XML document
+    is parsed as soon as it has been read, on another thread or process pool.
+    Reading pauses while too many documents (twice the number of workers) wait to
+    be parsed, so that they don't pile up in memory.  Files
+    holding identical OME-XML (e.g. the files of a multi-file OME-TIFF) are only
+    parsed once: they share the same `OME` object.  Errors are reported per file,
+    without stopping the batch.
 
-def tiff2xml(path: Path | str | BinaryIO) -> bytes:
-    """Extract the OME-XML from a TIFF file."""
-    if hasattr(path, "read"):
-        ctx: AbstractContextManager[BinaryIO] = nullcontext(path)  # type: ignore[arg-type]
+    Parameters
+    ----------
+    paths : Iterable[Path | str]
+        Paths to TIFF files.
+    workers : int | None
+        The maximum number of workers of each pool.  By default, the defaults of
+        `ThreadPoolExecutor` and `ProcessPoolExecutor`.
+    executor : Literal["thread", "process"]
+        Whether the OME-XML is parsed on a thread pool (the default) or a process
+        pool.  Parsing is CPU-bound, so a process pool scales better with many
+        cores, at the cost of pickling the `OME` objects back.
+    ordered : bool
+        If True (the default), results are yielded in the order of `paths`.
+        Otherwise, they are yielded as they complete.
+    validate : bool | None
+        Passed to `from_xml`.
+    parser_kwargs : ParserKwargs | None
+        Passed to `from_xml`.  Must be picklable if `executor` is "process".
+
+    Yields
+    ------
+    TiffResult
+        The path, the `OME` object (or None), and the error (or None) of each file.
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"executor must be 'thread' or 'process', not {executor!r}")
+    paths = list(paths)
+    results: list[Future[OME]] = [Future() for _ in paths]
+    parsed: dict[bytes, Future[OME]] = {}
+    lock = threading.Lock()
+
+    # documents read, and not parsed yet
+    pending = threading.BoundedSemaphore(2 * (workers or os.cpu_count() or 1))
+
+    io_pool = ThreadPoolExecutor(workers)
+    parse_pool: Executor
+    if executor == "process":
+        # workers are started while the reader threads are running: don't fork
+        methods = multiprocessing.get_all_start_methods()
+        context = "forkserver" if "forkserver" in methods else "spawn"
+        parse_pool = ProcessPoolExecutor(workers, multiprocessing.get_context(context))
     else:
-        ctx = Path(path).open(mode="rb")
-
-    with ctx as fh:
-        head = fh.read(4)
-        if head not in TIFF_TYPES:  # pragma: no cover
-            raise ValueError(f"{path!r} does not have a recognized TIFF header")
-
-        offset_fmt, tagno_fmt, tagsize, codeformat = TIFF_TYPES[head]
-        offset_size = offset_fmt.size
-        offset_size_4 = offset_size + 4
-
-        if offset_size == 8:
-            fh.seek(4, 1)
-        fh.seek(_unpack(fh, offset_fmt))
-        for _ in range(_unpack(fh, tagno_fmt)):
-            tagstruct = fh.read(tagsize)
-            if codeformat.unpack(tagstruct[:2])[0] == 270:
-                size = offset_fmt.unpack(tagstruct[4:offset_size_4])[0]
-                if size <= offset_size:
-                    desc = tagstruct[offset_size_4 : offset_size_4 + size]
-                    break
-                fh.seek(offset_fmt.unpack(tagstruct[-offset_size:])[0])
-                desc = fh.read(size)
-                break
-        else:  # pragma: no cover
-            raise ValueError(f"No OME metadata found in file: {path}")
-
-    if desc[-1] == 0:
-        desc = desc[:-1]  # pragma: no cover
+        parse_pool = ThreadPoolExecutor(workers)
+
+    def _read(index: int) -> None:
+        pending.acquire()
+        submitted = False
+        try:
+            xml = tiff2xml(paths[index])
+            key = hashlib.blake2b(xml, digest_size=20).digest()
+            with lock:
+                if (future := parsed.get(key)) is None:
+                    future = parsed[key] = parse_pool.submit(
+                        from_xml, xml, validate=validate, parser_kwargs=parser_kwargs
+                    )
+                    submitted = True
+                    future.add_done_callback(lambda _: pending.release())
+        except Exception as e:
+            results[index].set_exception(e)
+            return
+        finally:
+            if not submitted:
+                pending.release()
+        future.add_done_callback(partial(_copy_future, results[index]))
+
+    try:
+        for index in range(len(paths)):
+            io_pool.submit(_read, index)
+        indices = {future: index for index, future in enumerate(results)}
+        for future in results if ordered else as_completed(results):
+            path = paths[indices[future]]
+            try:
+                result = TiffResult(path, future.result())
+            except Exception as e:
+                result = TiffResult(path, None, e)
+            yield result
+    finally:
+        # (readers waiting for parses to finish are released as they are cancelled)
+        io_pool.shutdown(wait=False, cancel_futures=True)
+        parse_pool.shutdown(cancel_futures=True)
+        io_pool.shutdown()
+
+
+def _copy_future(dest: Future[Any], src: Future[Any]) -> None:
+    """Copy the outcome of the `src` future to `dest`."""
+    if src.cancelled():
+        dest.cancel()
+    elif (error := src.exception()) is not None:
+        dest.set_exception(error)
+    else:
+        dest.set_result(src.result())
+
+
+def tiff2xml(path: Path | str | BinaryIO, ifd: int | None = None) -> bytes:
+    """Extract the OME-XML from a TIFF file.
+
+    Parameters
+    ----------
+    path : Path | str | BinaryIO
+        Path to a TIFF file or a file-like object.  The file is memory-mapped, and
+        only the IFDs are read (see `TiffHeader`).
+    ifd : int | None
+        Return the ImageDescription of this IFD.  By default, the first
+        ImageDescription that holds OME-XML is returned: usually the one in the
+        first IFD, but some writers put it in a later one.  If none of them does,
+        the ImageDescription of the first IFD is returned, whatever it holds.
+    """
+    with TiffHeader(path) as tiff:
+        if ifd is None:
+            try:
+                return tiff.ome_xml()
+            except ValueError:
+                # (the caller's XML parser will report what is wrong with it)
+                if (desc := tiff.description(0)) is None:
+                    raise
+                return desc
+        desc = tiff.description(ifd)
+    if desc is None:
+        raise ValueError(f"No ImageDescription in IFD {ifd} of file: {path}")
     return desc
 
 
+def update_tiff_xml(
+    path: Path | str, ome: OME | str | bytes, *, ifd: int | None = None
+) -> None:
+    """Replace the OME-XML of a TIFF file, in place.
+
+    Only the ImageDescription and its tag entry are written: the new OME-XML
+    overwrites the old one if it is not longer, and is appended to the end of the
+    file otherwise (with the tag updated to point to it).  The image data is not
+    touched, so this costs as much I/O as the size of the OME-XML.
+
+    Parameters
+    ----------
+    path : Path | str
+        Path to a TIFF file.
+    ome : OME | str | bytes
+        The new metadata: an OME object (serialized with `to_xml`), or an XML
+        document.
+    ifd : int | None
+        The IFD whose ImageDescription is replaced.  By default, the first one that
+        holds OME-XML (see `tiff2xml`).
+    """
+    if isinstance(ome, BaseModel):
+        ome = to_xml(ome)
+    if isinstance(ome, str):
+        ome = ome.encode()
+    write_description(path, ome, ifd)
+
+
 # ------------------------
 
 
@@ -239,6 +1116,40 @@ def to_dict(source: OME | XMLSource) -> dict[str, Any]:
     )
 
 
+@overload
+def to_xml(
+    obj: OMEType,
+    *,
+    exclude_defaults: bool = ...,
+    exclude_unset: bool = ...,
+    indent: int = ...,
+    include_namespace: bool | None = ...,
+    include_schema_location: bool = ...,
+    canonicalize: bool = ...,
+    validate: bool = ...,
+    serializer_kwargs: SerializerKwargs | None = ...,
+    dest: None = ...,
+    compression: Literal["gzip"] | None = ...,
+) -> str: ...
+
+
+@overload
+def to_xml(
+    obj: OMEType,
+    *,
+    exclude_defaults: bool = ...,
+    exclude_unset: bool = ...,
+    indent: int = ...,
+    include_namespace: bool | None = ...,
+    include_schema_location: bool = ...,
+    canonicalize: bool = ...,
+    validate: bool = ...,
+    serializer_kwargs: SerializerKwargs | None = ...,
+    dest: XMLDest,
+    compression: Literal["gzip"] | None = ...,
+) -> None: ...
+
+
 def to_xml(
     obj: OMEType,
     *,
@@ -253,7 +1164,10 @@ def to_xml(
     include_schema_location: bool = True,
     canonicalize: bool = False,
     validate: bool = False,
-) -> str:
+    serializer_kwargs: SerializerKwargs | None = None,
+    dest: XMLDest | None = None,
+    compression: Literal["gzip"] | None = None,
+) -> str | None:
     """Generate an XML document from an OME object.
 
     Parameters
@@ -278,11 +1192,21 @@ def to_xml(
     validate : bool, optional
         Whether to validate the XML document against the OME schema, after rendering.
         (In most cases, this will be redundant and unnecessary.)
+    serializer_kwargs : SerializerKwargs | None
+        Passed to the XmlSerializer constructor. If None, a default serializer
+        (sharing a process-wide `XmlContext`) will be used.
+    dest : Path | str | IO | None
+        If given, the document is written to this path or (text or binary) file
+        object as it is serialized, instead of being returned: memory use then
+        doesn't grow with the size of the document.  Binary output is UTF-8.
+    compression : Literal["gzip"] | None
+        Compress the document written to `dest` with gzip.  By default, paths
+        ending with ".gz" are compressed.
 
     Returns
     -------
-    str
-        The XML document as a string.
+    str | None
+        The XML document as a string, or None if it was written to `dest`.
     """
     # xsdata>=24.2
     if hasattr(SerializerConfig, "indent"):
@@ -297,12 +1221,18 @@ def to_xml(
         xml_declaration=False,
         ignore_default_attributes=exclude_defaults,
         ignore_unset_attributes=exclude_unset,
-        attribute_sort_key=operator.attrgetter("name") if canonicalize else None,
     )
     if include_schema_location:
         config.schema_location = f"{OME_2016_06_URI} {OME_2016_06_URI}/ome.xsd"
 
-    serializer = XmlSerializer(config=config)
+    kwargs: SerializerKwargs = {
+        "context": _DEFAULT_SERIALIZER.context,
+        **(serializer_kwargs or {}),
+    }
+    serializer = _XmlSerializer(config=config, **kwargs)
+    if canonicalize:
+        # C14N 2.0, pretty-printed (as minidom does), in a single pass
+        serializer.writer = CanonicalXmlWriter
     if include_namespace is None:
         include_namespace = canonicalize
 
@@ -315,20 +1245,88 @@ def to_xml(
         obj._update_set_fields()
 
     ns_map = {"ome" if include_namespace else None: OME_2016_06_URI}
-    xml = serializer.render(obj, ns_map=ns_map)
+    if dest is not None:
+        if validate and not isinstance(dest, (str, os.PathLike)):
+            raise ValueError("validate=True requires `dest` to be a path")
+        with _open_dest(dest, compression) as out:
+            if not canonicalize:
+                serializer.writer = StreamingXmlWriter
+            serializer.write(out, obj, ns_map=ns_map)
+        if validate and isinstance(dest, (str, os.PathLike)):
+            with _open_dest_for_reading(dest, compression) as fh:
+                validate_xml(fh)
+        return None
 
-    if canonicalize:
-        xml = _canonicalize(xml, indent=" " * indent)
+    xml = serializer.render(obj, ns_map=ns_map)
     if validate:
         validate_xml(xml)
     return xml
 
 
-def _canonicalize(xml: str, indent: str) -> str:
-    from xml.dom import minidom
+def write_xml(obj: OMEType, dest: XMLDest, **kwargs: Any) -> None:
+    """Write an XML document of an OME object to a path or file object.
 
-    xml_out = ET.canonicalize(xml, strip_text=True)
-    return minidom.parseString(xml_out).toprettyxml(indent=indent)
+    Same as `to_xml(obj, dest=dest, **kwargs)`: the document is written as it is
+    serialized, and memory use doesn't grow with its size.  See `to_xml` for kwargs.
+    """
+    to_xml(obj, dest=dest, **kwargs)
+
+
+@contextmanager
+def _open_dest(dest: XMLDest, compression: Literal["gzip"] | None) -> Iterator[TextIO]:
+    """Open `dest` as a text stream (without closing it after, if it's a stream)."""
+    if isinstance(dest, (str, os.PathLike)):
+        if compression is None and os.fspath(dest).endswith(".gz"):
+            compression = "gzip"
+        opener = gzip.open if compression == "gzip" else open
+        with opener(dest, "wt", encoding="utf-8", newline="") as fh:
+            yield cast("TextIO", fh)
+    elif isinstance(dest, io.TextIOBase):
+        if compression is not None:
+            raise ValueError("compression requires `dest` to be a path or binary")
+        yield cast("TextIO", dest)
+    else:
+        with ExitStack() as stack:
+            raw = cast("BinaryIO", dest)
+            if compression == "gzip":
+                gz = gzip.GzipFile(fileobj=raw, mode="wb")
+                raw = cast("BinaryIO", stack.enter_context(gz))
+            text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            try:
+                yield text
+            finally:
+                text.flush()
+                text.detach()  # leave `dest` open
+
+
+def _open_dest_for_reading(
+    dest: str | os.PathLike, compression: Literal["gzip"] | None
+) -> BinaryIO:
+    if compression == "gzip" or (
+        compression is None and os.fspath(dest).endswith(".gz")
+    ):
+        return cast("BinaryIO", gzip.open(dest, "rb"))
+    return open(dest, "rb")
+
+
+class _XmlSerializer(XmlSerializer):
+    """XmlSerializer that writes out data held outside of model fields.
+
+    i.e. the `PlaneTable` of a `Pixels` as its planes, and the lazy value of a
+    `BinData` (see `from_xml(..., bin_data="lazy")`).
+    """
+
+    @classmethod
+    def next_value(cls, obj: Any, meta: XmlMeta) -> Iterator[tuple[XmlVar, Any]]:
+        if isinstance(obj, PixelsMixin) and obj._plane_table is not None:
+            field, load = "planes", obj._plane_table.to_planes
+        elif isinstance(obj, BinDataMixin) and obj._lazy_value is not None:
+            field, load = "value", obj._lazy_value.load
+        else:
+            yield from super().next_value(obj, meta)
+            return
+        for var, value in super().next_value(obj, meta):
+            yield var, load() if var.name == field else value
 
 
 # ------------------------
@@ -366,13 +1364,17 @@ def validate_xml_with_lxml(
     from lxml import etree
 
     tree = ensure_2016(xml, warn_on_schema_update=warn_on_schema_update, as_tree=True)
-    xmlschema = etree.XMLSchema(etree.parse(schema or OME_2016_06_XSD))
+    xmlschema = _get_schema(schema or OME_2016_06_XSD, _build_lxml_schema)
 
-    if not xmlschema.validate(cast("ET._ElementTree", tree)):
+    # assertValid (rather than validate + xmlschema.error_log) keeps the error log
+    # local to this call, since the cached schema may be shared across threads.
+    try:
+        xmlschema.assertValid(cast("ET._ElementTree", tree))
+    except etree.DocumentInvalid as e:
         msg = f"Validation of {str(xml)[:20]!r} failed:"
-        for error in xmlschema.error_log:
+        for error in e.error_log:
             msg += f"\n  - line {error.line}: {error.message}"
-        raise ValidationError(msg)
+        raise ValidationError(msg) from None
     return tree
 
 
@@ -391,8 +1393,47 @@ def validate_xml_with_xmlschema(
     return tree
 
 
-@cache
+# compiled schemas, keyed on (builder, schema path, schema mtime)
+_SCHEMA_CACHE: dict[tuple[Callable, str, float], Any] = {}
+_SCHEMA_LOCK = threading.Lock()
+
+
+def clear_schema_cache() -> None:
+    """Clear the cache of compiled XML schemas used by `validate_xml`.
+
+    Schemas are cached per process, keyed on their path and modification time, so
+    this is only needed to release memory, or if a schema file is modified in place
+    without its mtime changing.
+    """
+    with _SCHEMA_LOCK:
+        _SCHEMA_CACHE.clear()
+
+
+def _get_schema(schema: Path | str, builder: Callable[[str], Any]) -> Any:
+    """Return the compiled schema at path `schema`, building it only once."""
+    path = str(schema)
+    mtime = 0.0
+    if os.path.isfile(path):  # (schema may also be a URL)
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+    key = (builder, path, mtime)
+    with _SCHEMA_LOCK:
+        if key not in _SCHEMA_CACHE:
+            _SCHEMA_CACHE[key] = builder(path)
+        return _SCHEMA_CACHE[key]
+
+
+def _build_lxml_schema(schema: str) -> ET.XMLSchema:
+    from lxml import etree
+
+    return etree.XMLSchema(etree.parse(schema))
+
+
 def _get_XMLSchema(schema: Path | str) -> xmlschema.XMLSchema:
+    return cast("xmlschema.XMLSchema", _get_schema(schema, _build_XMLSchema))
+
+
+def _build_XMLSchema(schema: str) -> xmlschema.XMLSchema:
     import xmlschema
 
     xml_schema = xmlschema.XMLSchema(schema)
@@ -450,7 +1491,8 @@ def ensure_2016(
     -------
     FileLike | AnyElementTree
         If `as_tree` is `True`, an ElementTree, otherwise a FileLike object representing
-        transformed OME 2016 XML.
+        transformed OME 2016 XML. (A path to a file that is already OME 2016 XML is
+        returned unchanged.)
 
 
     Raises
@@ -460,54 +1502,165 @@ def ensure_2016(
     ImportError
         If lxml is not installed and a transformation is required.
     """
+    prolog = _sniff_source(source)
+    if not as_tree and prolog.path is not None and prolog.ns == OME_2016_06_URI:
+        # nothing to upgrade: return the path, rather than an open file that the
+        # caller would have to close.
+        prolog.stream.close()
+        return prolog.path
+    return _upgrade_2016(prolog, warn_on_schema_update, as_tree)
+
+
+def _sniff_source(source: XMLSource) -> _Prolog:
     normed_source = _normalize(source)
     try:
-        ns_in = _get_ns_file(normed_source)
+        return _sniff_prolog(normed_source)
     except Exception as e:
         raise ValueError(f"Could not parse XML from {source!r}") from e
 
-    # catch rare case of OME-XML with lowercase ome in namespace
-    if "Schemas/ome/" in ns_in:
-        normed_source = _capitalize_ome(normed_source)
-        ns_in = _get_ns_file(normed_source)
 
-    if hasattr(normed_source, "seek"):
-        normed_source.seek(0)
+def _upgrade_2016(
+    prolog: _Prolog, warn_on_schema_update: bool, as_tree: bool
+) -> FileLike | AnyElementTree:
+    """Implementation of `ensure_2016`, for a source that has already been sniffed.
 
+    The sniffed stream is closed, unless it is returned (when `as_tree` is False and
+    no upgrade is needed), in which case the caller must close it.
+    """
+    ns_in, stream = prolog.ns, prolog.stream
     if ns_in == OME_2016_06_URI:
-        if as_tree:
-            return ET.parse(normed_source)
-        return normed_source
+        if not as_tree:
+            return stream
+        with stream:
+            return ET.parse(stream)
 
     if ns_in in TRANSFORMS:
-        tree = ET.parse(normed_source)
-        ns = ns_in
-        while ns in TRANSFORMS:
-            tree = _apply_xslt(tree, TRANSFORMS[ns])
-            ns = _get_ns_elem(tree)
+        with stream:
+            tree = ET.parse(stream)
+        for xslt_path in _upgrade_chain(ns_in):
+            tree = _apply_xslt(tree, xslt_path)
         if warn_on_schema_update:
             warnings.warn(
                 f"Transformed source from {ns_in!r} to {OME_2016_06_URI!r}",
-                stacklevel=2,
+                stacklevel=3,
             )
 
         return tree if as_tree else io.BytesIO(ET.tostring(tree, encoding="utf-8"))
 
+    stream.close()
     raise ValueError(f"Unsupported document namespace {ns_in!r}")
 
 
-def _capitalize_ome(source: FileLike) -> FileLike:
-    """Fix OME namespace capitalization errors."""
-    if hasattr(source, "read") and hasattr(source, "seek"):
-        source.seek(0)
-        data = source.read()
+class _Prolog(NamedTuple):
+    """The result of sniffing the start of an XML document."""
+
+    # a stream of the full document, starting from the beginning
+    stream: _PrefixedStream | io.BytesIO
+    # namespace of the root element
+    ns: str
+    # tag of the root element, including namespace
+    root_tag: str
+    # the path that `stream` was opened from, if the source was a file path
+    path: str | None = None
+
+
+# bytes read at a time while looking for the root element
+_SNIFF_CHUNK = 4096
+
+
+def _sniff_prolog(source: FileLike) -> _Prolog:
+    """Read just enough of `source` to find its root element, opening it only once.
+
+    The bytes that were read are kept, and replayed by the returned stream before
+    the remainder of the file, so that the main parse doesn't have to re-open (or
+    seek back in) the source.
+    """
+    if isinstance(source, str):
+        # (closed by the _PrefixedStream returned below)
+        fh: BinaryIO = open(source, "rb")
     else:
-        with open(source, "rb") as fh:
-            data = fh.read()
+        fh = cast("BinaryIO", source)
+        if fh.seekable():
+            fh.seek(0)
+
+    prefix = b""
+    root = None
+    pull_parser = ET.XMLPullParser(events=("start",))
+    try:
+        while root is None:
+            chunk = fh.read(_SNIFF_CHUNK)
+            if not chunk:
+                raise ValueError("No root element found")
+            prefix += chunk
+            pull_parser.feed(chunk)
+            root = next((elem for _, elem in pull_parser.read_events()), None)
+    except Exception:
+        if isinstance(source, str):
+            fh.close()
+        raise
+
+    ns = _get_ns_elem(root)
+    root_tag = str(root.tag)
+    # catch rare case of OME-XML with lowercase ome in namespace
+    if "Schemas/ome/" in ns:
+        with _PrefixedStream(prefix, fh, close_fh=isinstance(source, str)) as stream:
+            data = stream.read().replace(b"Schemas/ome/", b"Schemas/OME/")
+        ns = ns.replace("Schemas/ome/", "Schemas/OME/")
+        root_tag = root_tag.replace("Schemas/ome/", "Schemas/OME/")
+        return _Prolog(io.BytesIO(data), ns, root_tag)
+
+    if isinstance(source, str):
+        return _Prolog(_PrefixedStream(prefix, fh, close_fh=True), ns, root_tag, source)
+    return _Prolog(_PrefixedStream(prefix, fh), ns, root_tag)
 
-    io_out = io.BytesIO(data.replace(b"Schemas/ome/", b"Schemas/OME/"))
-    io_out.seek(0)
-    return io_out
+
+class _PrefixedStream(io.BufferedIOBase):
+    """Read-only stream that replays already-read `prefix` bytes, followed by `fh`.
+
+    If `close_fh` is True, `fh` is closed when this stream is closed.
+    """
+
+    def __init__(self, prefix: bytes, fh: BinaryIO, close_fh: bool = False) -> None:
+        self._prefix = prefix
+        self._fh = fh
+        self._close_fh = close_fh
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._fh.seekable()
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None:
+            size = -1
+        if not self._prefix:
+            return self._fh.read(size)
+        if size < 0:
+            data, self._prefix = self._prefix + self._fh.read(), b""
+        elif size <= len(self._prefix):
+            data, self._prefix = self._prefix[:size], self._prefix[size:]
+        else:
+            data = self._prefix + self._fh.read(size - len(self._prefix))
+            self._prefix = b""
+        return data
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def tell(self) -> int:
+        return self._fh.tell() - len(self._prefix)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset, whence = self.tell() + offset, io.SEEK_SET
+        self._prefix = b""
+        return self._fh.seek(offset, whence)
+
+    def close(self) -> None:
+        if not self.closed and self._close_fh:
+            self._fh.close()
+        super().close()
 
 
 def _normalize(source: XMLSource) -> FileLike:
@@ -542,7 +1695,7 @@ def _normalize(source: XMLSource) -> FileLike:
 def _apply_xslt(root: ET._ElementTree, xslt_path: str | Path) -> _XSLTResultTree:
     """Apply an XSLT transform to an element or element tree."""
     try:
-        from lxml import etree
+        transformer = _get_xslt(Path(xslt_path))
     except ImportError:  # pragma: no cover
         ns = _get_ns_elem(root)
         raise ImportError(
@@ -551,11 +1704,41 @@ def _apply_xslt(root: ET._ElementTree, xslt_path: str | Path) -> _XSLTResultTree
             "Please run `pip install lxml`"
         ) from None
 
-    # Create a transformer object
-    transformer = etree.XSLT(ET.parse(xslt_path))
     return transformer(root)
 
 
+def precompile_transforms() -> None:
+    """Compile all of the OME schema upgrade stylesheets ahead of time.
+
+    Compiled stylesheets are cached per process the first time a document in an
+    older namespace is encountered.  When upgrading many legacy documents (e.g. in a
+    pool of worker processes), calling this first avoids paying the compilation cost
+    during the first upgrade of each namespace.
+    """
+    for ns in TRANSFORMS:
+        for xslt_path in _upgrade_chain(ns):
+            _get_xslt(xslt_path)
+
+
+@cache
+def _get_xslt(xslt_path: Path) -> XSLT:
+    """Return the compiled XSLT transform at `xslt_path`."""
+    from lxml import etree
+
+    return etree.XSLT(etree.parse(str(xslt_path)))
+
+
+@cache
+def _upgrade_chain(ns: str) -> tuple[Path, ...]:
+    """Return the sequence of stylesheets that upgrade namespace `ns` to 2016-06."""
+    chain: list[Path] = []
+    while ns in TRANSFORMS:
+        xslt_path = TRANSFORMS[ns]
+        chain.append(xslt_path)
+        ns = f"{OME_ROOT}/{xslt_path.stem.split('-to-')[1]}"
+    return tuple(chain)
+
+
 # ------------------------
 
 
@@ -566,28 +1749,24 @@ def _get_ns_elem(elem: ET._Element | AnyElementTree) -> str:
     return str(root.tag).split("}", 1)[0].lstrip("{")
 
 
-def _get_ns_file(source: FileLike) -> str:
-    """Get namespace from a file or file-like object."""
-    if hasattr(source, "seek"):
-        source.seek(0)
-    _, root = next(ET.iterparse(source, events=("start",)))
-    return _get_ns_elem(root)  # type: ignore[arg-type]
-
-
 def _get_root_ome_type(xml: FileLike | AnyElementTree) -> type[OMEType]:
     """Resolve a ome_types.model class for the root element of an OME XML document."""
-    from ome_types import model
-
     if hasattr(xml, "getroot"):
         root = xml.getroot()
     else:
         if hasattr(xml, "seek"):
             xml.seek(0)
         _, root = next(ET.iterparse(xml, events=("start",)))
-    localname = str(root.tag).rsplit("}", 1)[-1]
+        if hasattr(xml, "seek"):
+            xml.seek(0)
+    return _ome_type_for_tag(str(root.tag))
+
+
+def _ome_type_for_tag(tag: str) -> type[OMEType]:
+    """Resolve a ome_types.model class for an element tag."""
+    from ome_types import model
 
-    if hasattr(xml, "seek"):
-        xml.seek(0)
+    localname = tag.rsplit("}", 1)[-1]
     try:
         return getattr(model, localname)
     except AttributeError:
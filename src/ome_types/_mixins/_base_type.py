@@ -1,5 +1,5 @@
 import warnings
-from collections.abc import Sequence
+from collections.abc import MutableSequence, Sequence
 from datetime import datetime
 from enum import Enum
 from textwrap import indent
@@ -8,7 +8,18 @@ from typing import TYPE_CHECKING, Any, ClassVar, Optional, TypeVar, cast
 from pydantic import BaseModel, field_validator
 
 from ome_types._mixins._ids import validate_id
-from ome_types._pydantic_compat import field_type, update_set_fields
+from ome_types._mixins._tracking import (
+    TrackedList,
+    add_parent,
+    is_clean,
+    mark_dirty,
+    owns,
+    remove_parent,
+    roots_of,
+    set_clean,
+    track_lists,
+)
+from ome_types._pydantic_compat import field_type, get_default, update_set_fields
 
 try:
     from ome_types.units import add_quantity_properties
@@ -76,6 +87,9 @@ class OMEType(BaseModel):
         "validate_default": True,
         "coerce_numbers_to_str": True,
     }
+    # change tracking state (see `_update_set_fields`), and the OME objects that
+    # have indexed this object (see `OMEMixin._replace`), never copied or compared
+    __slots__ = ("__weakref__", "_clean", "_parents", "_roots")
 
     _vid = field_validator("id", mode="before", check_fields=False)(validate_id)
 
@@ -87,6 +101,7 @@ class OMEType(BaseModel):
         field_names = set(self.model_fields)
         _move_deprecated_fields(data, field_names)
         super().__init__(**data)
+        track_lists(self)
         if type(self).__name__ == "Map":
             # special escape hack for Map subclass, which can convert any
             # dict into appropriate key-value pairs
@@ -99,6 +114,25 @@ class OMEType(BaseModel):
                 stacklevel=3,
             )
 
+    if not TYPE_CHECKING:
+
+        def __setattr__(self, name: str, value: Any) -> None:
+            if name not in type(self).model_fields:
+                super().__setattr__(name, value)
+                return
+            old = self.__dict__.get(name)
+            super().__setattr__(name, value)
+            new = self.__dict__[name]
+            if type(new) is list:
+                new = self.__dict__[name] = TrackedList(new, self)
+            remove_parent(old if isinstance(old, list) else (old,), self)
+            mark_dirty(self)
+            for root in roots_of(self):
+                if name == "id":
+                    root._id_changed(self, old)
+                else:
+                    root._replace(self, (old,), (new,))
+
     def __init_subclass__(cls) -> None:
         """Add `*_quantity` property for fields that have both a value and a unit.
 
@@ -182,8 +216,54 @@ class OMEType(BaseModel):
         a field has been "set" by mutating a sequence.  This method updates the
         `model_fields_set` attribute to reflect that.  We assume that if an attribute
         is not None, and is not equal to the default value, then it has been set.
+
+        Only objects that changed since the last call (and the objects that contain
+        them) are examined again.
         """
-        update_set_fields(self)
+        _update_set_fields(self)
+
+
+def _update_set_fields(obj: OMEType) -> bool:
+    """Update the set fields of `obj` and its children, if it changed.
+
+    Returns whether `obj` is now clean (i.e. all changes to it will be tracked).
+    """
+    if is_clean(obj):
+        return True
+    clean = True
+    fields_set = obj.model_fields_set
+    for field_name, field in type(obj).model_fields.items():
+        current = getattr(obj, field_name)
+        if isinstance(current, list):
+            clean = owns(obj, current) and clean
+        elif isinstance(current, OMEType) and not current:
+            # an empty collection: nothing to update, but changes to it must be seen
+            clean = _update_child(current, obj) and clean
+        if not current:
+            continue
+        if current != get_default(field):
+            fields_set.add(field_name)
+        if isinstance(current, BaseModel):
+            clean = _update_child(current, obj) and clean
+        if isinstance(current, MutableSequence):
+            for item in current:
+                if isinstance(item, BaseModel):
+                    clean = _update_child(item, obj) and clean
+    set_clean(obj, clean)
+    return clean
+
+
+def _update_child(child: BaseModel, parent: OMEType) -> bool:
+    if isinstance(child, OMEType):
+        add_parent(child, parent)
+        return _update_set_fields(child)
+    # other models aren't tracked, so they are examined whenever their parent is.
+    # Generic XML elements are written whatever their set fields are, so their
+    # parent can be clean anyway (changes to them don't need to be seen).
+    from xsdata_pydantic_basemodel.compat import AnyElement
+
+    update_set_fields(child)
+    return isinstance(child, AnyElement)
 
 
 class _RawRepr:
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import binascii
+import bz2
+import math
+import mmap
+import zlib
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
+
+from pydantic import PrivateAttr
+
+from ome_types._mixins._base_type import OMEType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from pathlib import Path
+
+    import numpy as np
+    import numpy.typing as npt
+
+    from ome_types._autogenerated.ome_2016_06 import BinData
+
+# size of the chunks that compressed data is decompressed in
+_CHUNK = 1 << 20
+
+
+class LazyValue(NamedTuple):
+    """Location of the (base64) value of a BinData in its source document."""
+
+    # the path of the document, or its content
+    source: Path | bytes
+    start: int
+    stop: int
+
+    def load(self) -> bytes:
+        """Read and decode the value (memory-mapping the source if it's a path)."""
+        if isinstance(self.source, bytes):
+            text = self.source[self.start : self.stop]
+        else:
+            with open(self.source, "rb") as fh:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    text = buf[self.start : self.stop]
+        return binascii.a2b_base64(text)
+
+
+class BinDataMixin(OMEType):
+    # set when parsed with `from_xml(..., bin_data="lazy")`
+    _lazy_value: Any = PrivateAttr(None)
+
+    def load_value(self) -> bytes:
+        """Return `value`, loading it from the source document first if needed.
+
+        Documents parsed with `from_xml(..., bin_data="lazy")` leave `value` empty,
+        and only record where it is in the source.  This reads it from there, and
+        stores it in `value`.
+        """
+        slf = cast("BinData", self)
+        if self._lazy_value is not None:
+            slf.value = self._lazy_value.load()
+            self._lazy_value = None
+        return slf.value
+
+    def as_array(
+        self,
+        dtype: npt.DTypeLike,
+        shape: int | Sequence[int] | None = None,
+        *,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Decode `value` into a NumPy array.
+
+        `value` is decompressed according to `compression`, and read in the byte
+        order given by `big_endian`.  Nothing is decoded until this is called (and
+        for documents parsed with `from_xml(..., bin_data="lazy")`, the value is
+        read from the source document, without being kept).  Requires NumPy.
+
+        Parameters
+        ----------
+        dtype : npt.DTypeLike
+            The data type of the elements (its byte order is ignored).  A `bool`
+            dtype reads a bitmask packed 8 elements per byte, most significant bit
+            first (as used for "bit" pixels).
+        shape : int | Sequence[int] | None
+            The shape of the array.  By default, a 1D array of all elements.
+        out : np.ndarray | None
+            A preallocated, C-contiguous array to decode into.  Compressed data is
+            then decompressed straight into it.
+
+        Returns
+        -------
+        np.ndarray
+            The decoded array (`out`, if it was given).  When `value` is not
+            compressed and `out` is not given, this is a read-only view of `value`.
+        """
+        import numpy as np
+
+        slf = cast("BinData", self)
+        dtype = np.dtype(dtype)
+        stored = dtype.newbyteorder(">" if slf.big_endian else "<")
+        if out is not None:
+            if out.dtype.newbyteorder("=") != dtype.newbyteorder("="):
+                raise ValueError(f"out must have dtype {dtype}, not {out.dtype}")
+            if not out.flags.c_contiguous:
+                raise ValueError("out must be C-contiguous")
+            if shape is not None and out.shape != _as_shape(shape):
+                raise ValueError(f"out must have shape {shape}, not {out.shape}")
+            shape = out.shape
+
+        compressed = slf.compression.value != "none"
+        if dtype == np.bool_:
+            bits = np.frombuffer(self._decompressed(), np.uint8)
+            count = None if shape is None else math.prod(_as_shape(shape))
+            mask = np.unpackbits(bits, count=count).view(np.bool_)
+            if out is None:
+                return mask if shape is None else mask.reshape(shape)
+            out.reshape(-1)[:] = mask
+            return out
+
+        if out is None:
+            if not compressed or shape is None:
+                array = np.frombuffer(self._decompressed(), stored)
+                return array if shape is None else array.reshape(shape)
+            out = np.empty(shape, stored)
+
+        if compressed:
+            buffer = out.reshape(-1).view(np.uint8).data
+            size = 0
+            for chunk in _decompress(self._value(), slf.compression.value):
+                if size + len(chunk) > out.nbytes:
+                    raise ValueError("BinData holds more data than fits in shape")
+                buffer[size : size + len(chunk)] = chunk
+                size += len(chunk)
+            if size != out.nbytes:
+                raise ValueError("BinData holds less data than fits in shape")
+            if out.dtype.isnative != stored.isnative and dtype.itemsize > 1:
+                out.byteswap(inplace=True)
+        else:
+            out[...] = np.frombuffer(self._value(), stored).reshape(out.shape)
+        return out
+
+    def _value(self) -> bytes:
+        """Return `value`, reading it from the source document if it's lazy."""
+        if self._lazy_value is not None:
+            return cast("bytes", self._lazy_value.load())
+        return cast("BinData", self).value
+
+    def _decompressed(self) -> bytes:
+        slf = cast("BinData", self)
+        if slf.compression.value == "none":
+            return self._value()
+        return b"".join(_decompress(self._value(), slf.compression.value))
+
+
+def _decompress(data: bytes, compression: str) -> Iterator[bytes]:
+    """Decompress `data` in chunks of at most `_CHUNK` bytes."""
+    if compression == "zlib":
+        zobj = zlib.decompressobj()
+        while data:
+            yield zobj.decompress(data, _CHUNK)
+            data = zobj.unconsumed_tail
+        yield zobj.flush()
+    elif compression == "bzip2":
+        bobj = bz2.BZ2Decompressor()
+        yield bobj.decompress(data, _CHUNK)
+        while not bobj.eof and not bobj.needs_input:
+            yield bobj.decompress(b"", _CHUNK)
+    else:  # pragma: no cover
+        raise ValueError(f"Unsupported BinData compression: {compression!r}")
+
+
+def _as_shape(shape: int | Sequence[int]) -> tuple[int, ...]:
+    return (shape,) if isinstance(shape, int) else tuple(shape)
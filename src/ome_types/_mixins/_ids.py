@@ -1,34 +1,104 @@
 from __future__ import annotations
 
 import re
+import threading
 import warnings
-from contextlib import suppress
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from functools import cache
 from typing import TYPE_CHECKING, Any, cast
 
 from ome_types._pydantic_compat import field_regex
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from typing import Final
 
     from pydantic import BaseModel
 
 # Default value to support automatic numbering for id field values.
 AUTO_SEQUENCE: Final = "__auto_sequence__"
-# map of id_name -> max id value
-ID_COUNTER: dict[str, int] = {}
 
-# map of (id_name, id_value) -> converted id
-# NOTE: this is cleared in OMEMixin.__init__, so that the set of converted IDs
-# is unique to each OME instance
-CONVERTED_IDS: dict[tuple[str, str], str] = {}
 
+class IdContext:
+    """The state of ID allocation, for one document (or for the whole process).
 
-def _get_id_name_and_pattern(cls: type[BaseModel]) -> tuple[str, str]:
+    Holds the maximum ID value seen for each ID name (so that automatic numbering
+    continues after it), and the invalid IDs that have been converted (so that
+    references to an invalid ID are converted the same way as the ID itself).
+    It is safe to share between threads.
+    """
+
+    def __init__(self, counter: dict[str, int] | None = None) -> None:
+        # map of id_name -> max id value
+        self.counter: dict[str, int] = dict(counter or {})
+        # map of (id_name, id_value) -> converted id
+        self.converted: dict[tuple[str, str], str] = {}
+        self.lock = threading.Lock()
+
+    def new_document(self) -> IdContext:
+        """Return a context for a new document, numbering after this one."""
+        with self.lock:
+            return IdContext(self.counter)
+
+    def update(self, other: IdContext) -> None:
+        """Continue numbering after the IDs seen in `other`."""
+        with self.lock:
+            for id_name, count in other.counter.items():
+                if count > self.counter.get(id_name, -1):
+                    self.counter[id_name] = count
+
+    @contextmanager
+    def active(self) -> Iterator[IdContext]:
+        """Allocate IDs with this context, in the current thread or task."""
+        token = _ID_CONTEXT.set(self)
+        try:
+            yield self
+        finally:
+            _ID_CONTEXT.reset(token)
+
+
+# the context used outside of any document, (deliberately) shared by all threads
+_ID_CONTEXT: ContextVar[IdContext] = ContextVar(
+    "ome_types_ids",
+    default=IdContext(),  # noqa: B039
+)
+
+
+def current_id_context() -> IdContext:
+    """Return the context that IDs are currently allocated with."""
+    return _ID_CONTEXT.get()
+
+
+@contextmanager
+def id_scope() -> Iterator[IdContext]:
+    """Scope the allocation of IDs to one document, e.g. while parsing it.
+
+    Invalid IDs are only converted consistently within the scope, and automatic
+    numbering continues from the enclosing context, which in turn continues after
+    the IDs of the document once the scope exits.  Documents can so be parsed or
+    constructed in several threads at once.
+    """
+    parent = current_id_context()
+    context = parent.new_document()
+    try:
+        with context.active():
+            yield context
+    finally:
+        parent.update(context)
+
+
+@cache
+def _get_id_name_and_pattern(cls: type[BaseModel]) -> tuple[str, re.Pattern[str]]:
+    """Return the ID name of `cls`, and the compiled pattern of its IDs.
+
+    Computed once per class.
+    """
     # let this raise if it doesn't exist...
     # this should only be used on classes that have an id field
     id_pattern = cast(str, field_regex(cls, "id"))
     id_name = id_pattern.split(":")[-3]
-    return id_name, id_pattern
+    return id_name, re.compile(id_pattern)
 
 
 def validate_id(cls: type[BaseModel], value: int | str) -> Any:
@@ -41,46 +111,63 @@ def validate_id(cls: type[BaseModel], value: int | str) -> Any:
     2. if it's an integer, grab the appropriate ID name from the pattern and prepend it.
     3. if it's the special `AUTO_SEQUENCE` sentinel, use the next value in the sequence.
 
-    COUNTERS stores the maximum previously-seen value on the class.
+    The current `IdContext` stores the maximum previously-seen value for the class.
     """
+    context = current_id_context()
+    with context.lock:
+        return _validate_id(context, cls, value)
+
+
+def _validate_id(context: IdContext, cls: type[BaseModel], value: int | str) -> Any:
     id_name, id_pattern = _get_id_name_and_pattern(cls)
-    current_count = ID_COUNTER.setdefault(id_name, -1)
+    counter = context.counter
+
+    # fast path for the most common case, a well-formed "Name:int"
+    prefix = f"{id_name}:"
+    if (
+        isinstance(value, str)
+        and value.startswith(prefix)
+        and (digits := value[len(prefix) :]).isdecimal()
+    ):
+        if (number := int(digits)) > counter.get(id_name, -1):
+            counter[id_name] = number
+        return value
+
+    current_count = counter.setdefault(id_name, -1)
 
     if value == AUTO_SEQUENCE:
         # if it's the special sentinel, use the next value
-        value = ID_COUNTER[id_name] + 1
+        value = counter[id_name] + 1
     elif isinstance(value, str):
-        if (id_name, value) in CONVERTED_IDS:
-            # XXX: possible bug
-            # if the same invalid value is used across multiple documents
-            # we'll be replacing it with the same converted id here
-            return CONVERTED_IDS[(id_name, value)]
+        if (id_name, value) in context.converted:
+            # the same invalid value is converted the same way within a document
+            return context.converted[(id_name, value)]
 
         # if the value is a string, extract the number from it if possible
         value_id: str = value.rsplit(":", 1)[-1]
 
         # if the value matches the pattern, just return it
         # but update the counter if it's higher than the current value
-        if re.match(id_pattern, value):
+        if id_pattern.match(value):
             with suppress(ValueError):
                 # (not all IDs have integers after the colon)
-                ID_COUNTER[id_name] = max(current_count, int(value_id))
+                counter[id_name] = max(current_count, int(value_id))
             return value
 
         # if the value doesn't match the pattern, create a proper ID
         # (using the value_id as the integer part if possible)
         id_int = int(value_id) if value_id.isdecimal() else current_count + 1
-        newname = validate_id(cls, id_int)
+        newname = _validate_id(context, cls, id_int)
         # store the converted ID so we can use it elsewhere
-        CONVERTED_IDS[(id_name, value)] = newname
+        context.converted[(id_name, value)] = newname
 
         # warn the user
         msg = f"Casting invalid {id_name}ID {value!r} to {newname!r}"
-        warnings.warn(msg, stacklevel=2)
+        warnings.warn(msg, stacklevel=3)
         return newname
     elif not isinstance(value, int):  # pragma: no cover
         raise ValueError(f"Invalid ID value: {value!r}, {type(value)}")
 
     # update the counter to be at least this value
-    ID_COUNTER[id_name] = max(current_count, value)
+    counter[id_name] = max(current_count, value)
     return f"{id_name}:{value}"
@@ -1,36 +1,195 @@
 from __future__ import annotations
 
+import types
 import warnings
 import weakref
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Any, BinaryIO
+from contextlib import suppress
+from functools import cache, partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    NamedTuple,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
 
 from ome_types._mixins._base_type import OMEType
-from ome_types._mixins._ids import CONVERTED_IDS
+from ome_types._mixins._ids import id_scope
+from ome_types._mixins._tracking import TrackedList, owns
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
     from pathlib import Path
     from typing import Self
 
     from ome_types._autogenerated.ome_2016_06 import OME, Reference
 
 
-class OMEMixin:
+class _Removed:
+    pass
+
+
+# the link of a reference whose target was removed from the model (or changed id):
+# a dead weakref, so that `Reference.ref` returns None
+_DANGLING = weakref.ref(_Removed())
+
+
+class Referrer(NamedTuple):
+    """A reference to an object, and the object that holds the reference."""
+
+    reference: Reference
+    # None for references that are not in a model (e.g. in a list of references)
+    owner: OMEType | None
+
+
+class OMEMixin(OMEType):
+    # indices of the model, built by `_link_refs` and kept up to date as the model
+    # changes (never copied or compared).  Referrers are keyed by id(reference).
+    __slots__ = ("_id_index", "_referrers")
+    if TYPE_CHECKING:
+        _id_index: dict[str, OMEType]
+        _referrers: dict[str, dict[int, Referrer]]
+
     def __init__(self, **data: Any) -> None:
-        # Clear the cache of converted IDs, so that they are unique to each OME instance
-        CONVERTED_IDS.clear()
-        super().__init__(**data)
+        # IDs are converted (and numbered) per document
+        with id_scope():
+            super().__init__(**data)
         self._link_refs()
 
+    @property
+    def id_index(self) -> Mapping[str, OMEType]:
+        """All objects in this model that have an ID, by ID (read-only).
+
+        Built in the same pass that links references, when this object is created
+        (or copied, or unpickled), and updated as objects are added to or removed
+        from the model.
+        """
+        return types.MappingProxyType(self._indices()[0])
+
+    def referrers(self, obj_or_id: OMEType | str) -> list[Referrer]:
+        """Return all references to an object in this model, with their owners.
+
+        This is a lookup in an index that is built along with `id_index`, e.g. to
+        find the images that use an instrument, or the objects that an annotation
+        is attached to.
+
+        Parameters
+        ----------
+        obj_or_id : OMEType | str
+            The object (or its ID).  References to unknown IDs can be looked up by
+            ID too.
+
+        Returns
+        -------
+        list[Referrer]
+            `(reference, owner)` named tuples, where `owner` is the object holding
+            the reference (e.g. the `Image` that holds an `AnnotationRef`), in
+            document order (references added later come last).  Empty if nothing
+            refers to the object.
+        """
+        id_ = (
+            obj_or_id if isinstance(obj_or_id, str) else getattr(obj_or_id, "id", None)
+        )
+        if id_ is None:
+            raise TypeError(f"{type(obj_or_id).__name__} objects have no id")
+        return list(self._indices()[1].get(id_, {}).values())
+
+    def _indices(self) -> tuple[dict[str, OMEType], dict[str, dict[int, Referrer]]]:
+        try:
+            return self._id_index, self._referrers
+        except AttributeError:
+            # a shallow copy, sharing its objects with the original: the indices
+            # are those of the original, which maintains them
+            ids, references = collect_ids_and_references(self)
+            return ids, _index_referrers(references)
+
     def _link_refs(self) -> None:
-        ids = collect_ids(self)
-        for ref in collect_references(self):
+        ids, references = collect_ids_and_references(self, root=weakref.ref(self))
+        for ref, _ in references:
             # all reference subclasses do actually have an 'id' field
             # but it's not declared in the base class
-            if ref.id in ids:
-                ref._ref = weakref.ref(ids[ref.id])
+            if (target := ids.get(ref.id)) is not None:
+                ref._ref = weakref.ref(target)
             else:
                 warnings.warn(f"Reference to unknown ID: {ref.id}", stacklevel=2)
+        object.__setattr__(self, "_id_index", ids)
+        object.__setattr__(self, "_referrers", _index_referrers(references))
+
+    def _replace(
+        self, owner: OMEType, removed: Iterable[Any], added: Iterable[Any]
+    ) -> None:
+        """Update the indices after `removed` values were replaced by `added`.
+
+        Called when a field (or a list field) of `owner`, an object of this model,
+        changes.  Objects (and references) in `removed` are dropped from the
+        indices, and the references to them become dangling (`ref` is None).
+        Those in `added` are indexed, and the references to or from them are
+        resolved (references to unknown IDs are left unresolved until an object
+        with that ID is added).
+        """
+        try:
+            ids, referrers = self._id_index, self._referrers
+        except AttributeError:  # pragma: no cover
+            return
+        root = weakref.ref(self)
+        old_ids, old_references = collect_ids_and_references(
+            list(removed), root=root, attach=False
+        )
+        for id_, obj in old_ids.items():
+            if ids.get(id_) is obj:
+                del ids[id_]
+                for ref, _ in referrers.get(id_, {}).values():
+                    ref._ref = _DANGLING
+        for ref, _ in old_references:
+            if (refs := referrers.get(ref.id)) is not None:
+                refs.pop(id(ref), None)
+                if not refs:
+                    del referrers[ref.id]
+
+        new_ids, new_references = collect_ids_and_references(
+            list(added), owner, root=root
+        )
+        ids.update(new_ids)
+        for id_, obj in new_ids.items():
+            for ref, _ in referrers.get(id_, {}).values():
+                ref._ref = weakref.ref(obj)
+        for referrer in new_references:
+            ref = referrer.reference
+            referrers.setdefault(ref.id, {})[id(ref)] = referrer
+            target = ids.get(ref.id)
+            ref._ref = None if target is None else weakref.ref(target)
+
+    def _id_changed(self, obj: OMEType, old_id: str) -> None:
+        """Update the indices after `obj`, an object of this model, changed id."""
+        from ome_types.model import Reference
+
+        try:
+            ids, referrers = self._id_index, self._referrers
+        except AttributeError:  # pragma: no cover
+            return
+        new_id: str = obj.id
+        if isinstance(obj, Reference):
+            # a reference now refers to another object
+            refs = referrers.get(old_id, {})
+            if (referrer := refs.pop(id(obj), None)) is None:
+                return
+            if not refs:
+                del referrers[old_id]
+            referrers.setdefault(new_id, {})[id(obj)] = referrer
+            target = ids.get(new_id)
+            obj._ref = None if target is None else weakref.ref(target)
+            return
+        if ids.get(old_id) is obj:
+            del ids[old_id]
+            for ref, _ in referrers.get(old_id, {}).values():
+                ref._ref = _DANGLING
+        ids[new_id] = obj
+        for ref, _ in referrers.get(new_id, {}).values():
+            ref._ref = weakref.ref(obj)
 
     if not TYPE_CHECKING:
 
@@ -45,7 +204,7 @@ class OMEMixin:
 
     def __setstate__(self, state: dict[str, Any]) -> None:
         """Support unpickle of our weakref references."""
-        super().__setstate__(state)  # type: ignore
+        super().__setstate__(state)
         self._link_refs()
 
     @classmethod
@@ -59,48 +218,118 @@ class OMEMixin:
         return from_tiff(path)
 
 
-def collect_ids(value: Any) -> dict[str, OMEType]:
-    """Return a map of all model objects contained in value, keyed by id.
+def collect_ids_and_references(
+    value: Any,
+    owner: OMEType | None = None,
+    root: weakref.ref[OMEMixin] | None = None,
+    attach: bool = True,
+) -> tuple[dict[str, OMEType], list[Referrer]]:
+    """Return all model objects in value keyed by id, and all References in it.
 
-    Recursively walks all dataclass fields and iterates over lists. The base
-    case is when value is neither a dataclass nor a list.
+    Walks all fields of models and iterates over lists, in a single iterative
+    pass, in document order.  References are not walked into, and are returned
+    along with the object holding them (`owner` for those in value itself).  If
+    several objects have the same id, the last one is kept.
+
+    If `root` is given, it is recorded on all objects walked as one of the OME
+    objects that index them, and the lists they hold are tracked (or, if not
+    `attach`, it is removed from them).
     """
     from ome_types.model import Reference
 
     ids: dict[str, OMEType] = {}
-    if isinstance(value, Sequence) and not isinstance(value, str):
-        for v in value:
-            ids.update(collect_ids(v))
-    elif isinstance(value, OMEType):
-        for fname in value.model_fields:
-            if fname == "id" and not isinstance(value, Reference):
-                # We don't need to recurse on the id string, so just record it
-                # and move on.
-                ids[value.id] = value
+    references: list[Referrer] = []
+    if root is None:
+        update_roots = None
+    else:
+        update_roots = partial(_add_root if attach else _remove_root, root=root)
+    attach = attach and root is not None
+    # (value, object holding it)
+    stack: list[tuple[Any, OMEType | None]] = [(value, owner)]
+    while stack:
+        value, owner = stack.pop()
+        if isinstance(value, list):
+            stack.extend((item, owner) for item in reversed(value))
+        elif isinstance(value, Reference):
+            references.append(Referrer(value, owner))
+            if update_roots is not None:
+                update_roots(value)
+        elif isinstance(value, OMEType):
+            cls = type(value)
+            fields = value.__dict__
+            if "id" in cls.model_fields:
+                ids[fields["id"]] = value
+            if update_roots is not None:
+                update_roots(value)
+            if attach:
+                for name in _child_fields(cls):
+                    child = fields[name]
+                    if type(child) is TrackedList and child._owner is None:
+                        owns(value, child)
+                    # (empty collections are walked too, to track their lists)
+                    if child or isinstance(child, OMEType):
+                        stack.append((child, value))
             else:
-                ids.update(collect_ids(getattr(value, fname)))
-    # Do nothing for uninteresting types.
-    return ids
+                for name in _child_fields(cls):
+                    if child := fields[name]:
+                        stack.append((child, value))
+        # Do nothing for uninteresting types.
+    return ids, references
+
+
+_ROOTS = OMEType._roots  # type: ignore[attr-defined]
+
+
+def _add_root(obj: OMEType, root: weakref.ref[OMEMixin]) -> None:
+    # (the slot is accessed directly, as this runs for every object of a model)
+    try:
+        roots: list[weakref.ref[OMEMixin]] = _ROOTS.__get__(obj)
+    except AttributeError:
+        _ROOTS.__set__(obj, [root])
+        return
+    # a weakref without callback is cached, so identity can be compared
+    if not any(r is root for r in roots):
+        roots[:] = [r for r in roots if r() is not None]
+        roots.append(root)
+
+
+def _remove_root(obj: OMEType, root: weakref.ref[OMEMixin]) -> None:
+    with suppress(AttributeError):
+        roots: list[weakref.ref[OMEMixin]] = _ROOTS.__get__(obj)
+        roots[:] = [r for r in roots if r is not root and r() is not None]
+
+
+def collect_ids(value: Any) -> dict[str, OMEType]:
+    """Return a map of all model objects contained in value, keyed by id."""
+    return collect_ids_and_references(value)[0]
 
 
 def collect_references(value: Any) -> list[Reference]:
-    """Return a list of all References contained in value.
+    """Return a list of all References contained in value."""
+    return [referrer.reference for referrer in collect_ids_and_references(value)[1]]
 
-    Recursively walks all dataclass fields and iterates over lists. The base
-    case is when value is either a Reference object, or an uninteresting type
-    that we don't need to inspect further.
 
-    """
-    from ome_types.model import Reference
+def _index_referrers(references: list[Referrer]) -> dict[str, dict[int, Referrer]]:
+    referrers: dict[str, dict[int, Referrer]] = {}
+    for referrer in references:
+        ref = referrer.reference
+        referrers.setdefault(ref.id, {})[id(ref)] = referrer
+    return referrers
+
+
+@cache
+def _child_fields(cls: type[BaseModel]) -> tuple[str, ...]:
+    """Names of the fields of cls that may hold models, in reverse order."""
+    return tuple(
+        name
+        for name, field in reversed(cls.model_fields.items())
+        if _may_hold_models(field.annotation)
+    )
+
 
-    references: list[Reference] = []
-    if isinstance(value, Reference):
-        references.append(value)
-    elif isinstance(value, list):
-        for v in value:
-            references.extend(collect_references(v))
-    elif isinstance(value, OMEType):
-        for f in value.model_fields:
-            references.extend(collect_references(getattr(value, f)))
-    # Do nothing for uninteresting types
-    return references
+def _may_hold_models(annotation: Any) -> bool:
+    if get_origin(annotation) in (list, Union, getattr(types, "UnionType", Union)):
+        return any(_may_hold_models(arg) for arg in get_args(annotation))
+    if isinstance(annotation, type):
+        return annotation is object or issubclass(annotation, BaseModel)
+    return annotation is Any
@@ -0,0 +1,96 @@
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+from pydantic import PrivateAttr
+
+from ome_types._mixins._base_type import OMEType
+from ome_types._mixins._validators import pixel_type_to_numpy_dtype
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ome_types._autogenerated.ome_2016_06 import Pixels
+    from ome_types.model._plane_locator import PlaneLocator
+    from ome_types.model._plane_table import PlaneTable
+
+
+class PixelsMixin(OMEType):
+    # Optional[PlaneTable], but that can't be resolved at runtime without numpy
+    _plane_table: Any = PrivateAttr(None)
+
+    @property
+    def plane_table(self) -> "PlaneTable":
+        """Columnar (NumPy) representation of `planes`.
+
+        If planes were parsed directly into a table (`from_xml(..., plane_table=True)`)
+        or a table was assigned here, that table is returned, and `planes` is empty.
+        Otherwise, a new table is built from `planes`.  Requires NumPy.
+        """
+        if self._plane_table is not None:
+            return self._plane_table
+
+        from ome_types.model._plane_table import PlaneTable
+
+        return PlaneTable.from_planes(cast("Pixels", self).planes)
+
+    @plane_table.setter
+    def plane_table(self, table: Optional["PlaneTable"]) -> None:
+        # the table replaces `planes`, and is written out in its place by `to_xml`
+        slf = cast("Pixels", self)
+        if table is None:
+            if self._plane_table is not None:
+                slf.planes = self._plane_table.to_planes()
+        else:
+            slf.planes = []
+        self._plane_table = table
+
+    def plane_locator(self) -> "PlaneLocator":
+        """Return an index of the TIFF file and IFD holding each plane.
+
+        The index is built from `tiff_data_blocks` and `dimension_order` when this is
+        called, and maps (z, c, t) to a file and IFD in O(1), singly or in bulk.
+        See `PlaneLocator` for details.  Requires NumPy.
+        """
+        from ome_types.model._plane_locator import PlaneLocator
+
+        return PlaneLocator(cast("Pixels", self))
+
+    def bin_data_array(self) -> "np.ndarray":
+        """Decode `bin_data_blocks` into a single NumPy array.
+
+        The array has one axis per dimension, slowest varying first: e.g. for a
+        `dimension_order` of XYZCT, its shape is (size_t, size_c, size_z, size_y,
+        size_x).  It is allocated once, and each block (one per plane, usually) is
+        decoded straight into it.  See `BinData.as_array`.  Requires NumPy.
+        """
+        import numpy as np
+
+        slf = cast("Pixels", self)
+        if not slf.bin_data_blocks:
+            raise ValueError("Pixels has no BinData blocks")
+        order = slf.dimension_order.value
+        sizes = {
+            "X": slf.size_x,
+            "Y": slf.size_y,
+            "Z": slf.size_z,
+            "C": slf.size_c,
+            "T": slf.size_t,
+        }
+        dtype = np.dtype(pixel_type_to_numpy_dtype(slf.type))
+        out = np.empty([sizes[dim] for dim in reversed(order)], dtype)
+
+        planes = out.reshape(-1, slf.size_y, slf.size_x)
+        if len(slf.bin_data_blocks) == len(planes):
+            for block, plane in zip(slf.bin_data_blocks, planes):
+                block.as_array(dtype, out=plane)
+        else:
+            flat = out.reshape(-1)
+            start = 0
+            for block in slf.bin_data_blocks:
+                data = block.as_array(dtype)
+                flat[start : start + data.size] = data
+                start += data.size
+            if start != flat.size:
+                raise ValueError(
+                    f"BinData blocks hold {start} pixels, expected {flat.size}"
+                )
+        return out
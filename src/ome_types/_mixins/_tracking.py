@@ -0,0 +1,238 @@
+"""Change tracking for OME types, so that only changed subtrees are re-examined.
+
+`to_xml` (with `exclude_unset=True`) needs `model_fields_set` to reflect fields that
+were changed in place (e.g. by appending to a list), which pydantic doesn't see.
+Rather than re-examining every object of the model on each call, objects remember
+whether they have changed since they were last examined ("clean"), and changes
+mark the changed object and all the objects that contain it as dirty:
+
+- assigning to a field marks the object as dirty (see `OMEType.__setattr__`);
+- list fields are `TrackedList`s, which mark the object that owns them as dirty
+  when they are mutated;
+- objects know the objects that contain them (their "parents"), which are recorded
+  when the parent is examined, and forgotten when they are removed from it.
+
+The same notifications keep the indices of the `OME` object that contains the
+changed object (its "root") up to date: objects and references that are added or
+removed (e.g. by appending to a list) are added to or removed from `id_index` and
+`referrers`, and the references to them are resolved or invalidated (see
+`OMEMixin._replace`).  Objects know their roots (there may be several, if an object
+is shared by several models) once these have indexed them.
+
+This state is kept in slots of `OMEType`, so it is never copied, pickled or
+compared along with the fields: copies start out dirty.
+"""
+
+from __future__ import annotations
+
+import types
+import weakref
+from functools import cache
+from typing import TYPE_CHECKING, Any, SupportsIndex, Union, get_args, get_origin
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pydantic import BaseModel
+
+    from ome_types._mixins._ome import OMEMixin
+
+
+class TrackedList(list):
+    """A list that marks the object owning it as dirty when it is mutated."""
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, iterable: Iterable = (), owner: BaseModel | None = None) -> None:
+        super().__init__(iterable)
+        self._owner = None if owner is None else weakref.ref(owner)
+
+    def _changed(self, removed: Iterable[Any] = (), added: Iterable[Any] = ()) -> None:
+        if self._owner is not None and (owner := self._owner()) is not None:
+            remove_parent(removed, owner)
+            mark_dirty(owner)
+            if removed or added:
+                for root in roots_of(owner):
+                    root._replace(owner, removed, added)  # type: ignore[arg-type]
+
+    # copies (and unpickled lists) have no owner, until one adopts them
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (TrackedList, (list(self),))
+
+    def __copy__(self) -> TrackedList:
+        return TrackedList(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> TrackedList:
+        from copy import deepcopy
+
+        copy = memo[id(self)] = TrackedList()
+        list.extend(copy, (deepcopy(item, memo) for item in self))
+        return copy
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self._changed((), (item,))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        start = len(self)
+        super().extend(items)
+        self._changed((), self[start:])
+
+    def insert(self, index: SupportsIndex, item: Any) -> None:
+        super().insert(index, item)
+        self._changed((), (item,))
+
+    def remove(self, item: Any) -> None:
+        index = self.index(item)
+        removed = self[index]
+        super().__delitem__(index)
+        self._changed((removed,))
+
+    def pop(self, index: SupportsIndex = -1) -> Any:
+        item = super().pop(index)
+        self._changed((item,))
+        return item
+
+    def clear(self) -> None:
+        removed = self[:]
+        super().clear()
+        self._changed(removed)
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            removed, value = self[index], list(value)
+            super().__setitem__(index, value)
+            self._changed(removed, value)
+        else:
+            removed = self[index]
+            super().__setitem__(index, value)
+            self._changed((removed,), (value,))
+
+    def __delitem__(self, index: Any) -> None:
+        removed = self[index] if isinstance(index, slice) else (self[index],)
+        super().__delitem__(index)
+        self._changed(removed)
+
+    def __iadd__(self, items: Iterable[Any]) -> TrackedList:  # type: ignore[misc]
+        start = len(self)
+        super().__iadd__(items)
+        self._changed((), self[start:])
+        return self
+
+    def __imul__(self, n: SupportsIndex) -> TrackedList:
+        removed = self[:]
+        super().__imul__(n)
+        self._changed(removed, self[:])
+        return self
+
+
+def track_lists(obj: BaseModel) -> None:
+    """Replace the (freshly validated) list fields of `obj` with `TrackedList`s."""
+    values = obj.__dict__
+    for name in _list_fields(type(obj)):
+        if type(value := values.get(name)) is list:
+            # (built without the Python-level __init__, as this runs for every
+            # new object)
+            tracked = values[name] = list.__new__(TrackedList)
+            list.extend(tracked, value)
+            tracked._owner = weakref.ref(obj)
+
+
+@cache
+def _list_fields(cls: type[BaseModel]) -> tuple[str, ...]:
+    """Names of the fields of cls that may hold lists."""
+    return tuple(
+        name
+        for name, field in cls.model_fields.items()
+        if _may_be_list(field.annotation)
+    )
+
+
+def _may_be_list(annotation: Any) -> bool:
+    origin = get_origin(annotation)
+    if origin in (Union, getattr(types, "UnionType", Union)):
+        return any(_may_be_list(arg) for arg in get_args(annotation))
+    return list in (origin, annotation) or annotation in (Any, object)
+
+
+def owns(obj: BaseModel, value: list) -> bool:
+    """Return whether `obj` is notified of changes to `value`, one of its fields.
+
+    `TrackedList`s without an owner (copies) are adopted.  Plain lists (e.g. from
+    `model_construct`) and lists shared with another object (e.g. by a shallow
+    copy) can't be tracked.
+    """
+    if not isinstance(value, TrackedList):
+        return False
+    if value._owner is None:
+        value._owner = weakref.ref(obj)
+        return True
+    return value._owner() is obj
+
+
+def roots_of(obj: BaseModel) -> list[OMEMixin]:
+    """Return the `OME` objects that have indexed `obj` (and still contain it)."""
+    refs: list[weakref.ref[OMEMixin]] = getattr(obj, "_roots", [])
+    return [root for ref in refs if (root := ref()) is not None]
+
+
+def is_clean(obj: BaseModel) -> bool:
+    """Return whether `obj` is unchanged since it was last examined."""
+    try:
+        return obj._clean  # type: ignore[attr-defined]
+    except AttributeError:  # never examined
+        return False
+
+
+def set_clean(obj: BaseModel, clean: bool) -> None:
+    object.__setattr__(obj, "_clean", clean)
+
+
+def add_parent(obj: BaseModel, parent: BaseModel) -> None:
+    """Record that `obj` is contained in `parent`."""
+    # a weakref without callback is cached, so identity can be compared
+    ref = weakref.ref(parent)
+    try:
+        parents: list[weakref.ref] = obj._parents  # type: ignore[attr-defined]
+    except AttributeError:
+        object.__setattr__(obj, "_parents", [ref])
+        return
+    if not any(r is ref for r in parents):
+        parents.append(ref)
+
+
+def remove_parent(objs: Iterable[Any], parent: BaseModel) -> None:
+    """Forget that `objs` (values removed from `parent`) are contained in `parent`.
+
+    This is done even if `parent` still holds one of them elsewhere: `parent` is
+    then dirty, and records its children again when it is next examined.
+    """
+    for obj in objs:
+        if parents := getattr(obj, "_parents", None):
+            parents[:] = [
+                r for r in parents if (p := r()) is not None and p is not parent
+            ]
+
+
+def mark_dirty(obj: BaseModel) -> None:
+    """Mark `obj`, and all objects that contain it, as changed.
+
+    Clean objects only contain clean objects, so this stops at dirty ones.
+    """
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if not is_clean(obj):
+            continue
+        set_clean(obj, False)
+        for ref in getattr(obj, "_parents", ()):
+            if (parent := ref()) is not None:
+                stack.append(parent)
@@ -0,0 +1,290 @@
+"""Minimal, memory-mapped reader for the headers (IFDs) of TIFF files."""
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import re
+from pathlib import Path
+from struct import Struct
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+    from typing import BinaryIO, Self
+
+__all__ = ["TIFF_TYPES", "TiffHeader", "TiffTag", "write_description"]
+
+# header -> (offset struct, tag count struct, tag entry size, tag code struct)
+TIFF_TYPES: dict[bytes, tuple[Struct, Struct, int, Struct]] = {
+    b"II*\0": (Struct("<I"), Struct("<H"), 12, Struct("<H")),
+    b"MM\0*": (Struct(">I"), Struct(">H"), 12, Struct(">H")),
+    b"II+\0": (Struct("<Q"), Struct("<Q"), 20, Struct("<H")),
+    b"MM\0+": (Struct(">Q"), Struct(">Q"), 20, Struct(">H")),
+}
+
+IMAGE_DESCRIPTION = 270
+
+# size in bytes of each TIFF data type (BYTE, ASCII, SHORT, LONG, RATIONAL, ...)
+_TYPE_SIZES = {
+    1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8,
+    13: 4, 16: 8, 17: 8, 18: 8,
+}  # fmt: skip
+
+_OME_TAG = re.compile(rb"<(?:[\w.-]+:)?OME[\s>/]")
+
+
+class TiffTag(NamedTuple):
+    """A tag entry of an IFD."""
+
+    code: int
+    dtype: int
+    # number of values
+    value_count: int
+    # absolute offset in the file of the value (which may be inside the entry)
+    value_offset: int
+    # absolute offset in the file of the entry itself
+    entry_offset: int
+
+    @property
+    def nbytes(self) -> int:
+        return self.value_count * _TYPE_SIZES.get(self.dtype, 1)
+
+
+class TiffHeader:
+    """Reads the IFDs of a TIFF (or BigTIFF) file, through a memory map.
+
+    Tags are decoded straight from the memory map, so only the pages holding the
+    IFDs (and the values that are asked for) are read.  IFDs are located lazily:
+    the chain of IFDs is only followed as far as the IFD that is asked for.
+
+    Parameters
+    ----------
+    source : Path | str | bytes | BinaryIO
+        Path to a TIFF file, its content, or a file-like object.  File-like objects
+        that are real files are memory-mapped too; from others, only the ranges that
+        are needed are read (with `seek` and `read`).
+
+    Attributes
+    ----------
+    byteorder : str
+        "<" for little-endian files, ">" for big-endian files.
+    bigtiff : bool
+        Whether the file is a BigTIFF.
+    """
+
+    def __init__(self, source: Path | str | bytes | BinaryIO) -> None:
+        self._name = source if isinstance(source, (str, Path)) else "<file>"
+        self._mmap: mmap.mmap | None = None
+        # a file-like object that can't be memory-mapped (not owned, nor closed)
+        self._fh: BinaryIO | None = None
+        self._buf: bytes | memoryview | mmap.mmap = b""
+        if isinstance(source, (str, Path)):
+            with Path(source).open("rb") as fh:
+                try:
+                    self._buf = self._mmap = _mmap(fh)
+                except ValueError:  # empty file
+                    self._buf = b""
+        elif isinstance(source, bytes):
+            self._buf = source
+        elif isinstance(source, io.BytesIO):
+            self._buf = source.getbuffer()
+        else:
+            try:
+                self._buf = self._mmap = _mmap(source)
+            except (AttributeError, OSError, ValueError):
+                self._fh = source
+        self._size = len(self._buf) if self._fh is None else self._fh.seek(0, 2)
+
+        head = self._read(0, 4)
+        if head not in TIFF_TYPES:
+            self.close()
+            raise ValueError(f"{self._name!r} does not have a recognized TIFF header")
+        self._offset, self._tagno, self._tagsize, _ = TIFF_TYPES[head]
+        self.byteorder = "<" if head[:2] == b"II" else ">"
+        self.bigtiff = self._offset.size == 8
+        self._entry = Struct(self.byteorder + ("HHQQ" if self.bigtiff else "HHII"))
+        # IFDs found so far, and the offset of the next one (0 once all are found)
+        self._ifd_offsets: list[int] = []
+        self._ifd_seen: set[int] = set()
+        self._next_ifd = self._unpack(self._offset, 8 if self.bigtiff else 4)
+
+    @property
+    def ifd_offsets(self) -> list[int]:
+        """Absolute offsets in the file of all IFDs, in order."""
+        while self._find_next_ifd():
+            pass
+        return self._ifd_offsets
+
+    def has_ifd(self, ifd: int) -> bool:
+        """Return whether the file has IFD number `ifd` (following the chain to it)."""
+        while len(self._ifd_offsets) <= ifd:
+            if not self._find_next_ifd():
+                return False
+        return ifd >= 0
+
+    def _find_next_ifd(self) -> bool:
+        """Add the next IFD of the chain to `_ifd_offsets`; False if there is none."""
+        offset = self._next_ifd
+        # guard against malformed files whose IFDs form a cycle
+        if not 0 < offset <= self._size - self._tagno.size or offset in self._ifd_seen:
+            self._next_ifd = 0
+            return False
+        self._ifd_offsets.append(offset)
+        self._ifd_seen.add(offset)
+        ntags = self._unpack(self._tagno, offset)
+        next_at = offset + self._tagno.size + ntags * self._tagsize
+        if next_at + self._offset.size > self._size:
+            self._next_ifd = 0
+        else:
+            self._next_ifd = self._unpack(self._offset, next_at)
+        return True
+
+    def tags(self, ifd: int = 0) -> dict[int, TiffTag]:
+        """Return the tags of IFD number `ifd`, by code."""
+        if not self.has_ifd(ifd):
+            raise ValueError(f"No IFD {ifd} in file: {self._name}")
+        offset = self._ifd_offsets[ifd]
+        ntags = self._unpack(self._tagno, offset)
+        start = offset + self._tagno.size
+        # (all entries are read at once)
+        entries = self._read(start, ntags * self._tagsize)
+        entry, offset_size = self._entry, self._offset.size
+        tags: dict[int, TiffTag] = {}
+        for i in range(len(entries) // self._tagsize):
+            entry_offset = start + i * self._tagsize
+            code, dtype, count, value = entry.unpack_from(entries, i * self._tagsize)
+            tag = TiffTag(code, dtype, count, 0, entry_offset)
+            if tag.nbytes <= offset_size:
+                # the value is stored in the entry itself
+                value = entry_offset + self._tagsize - offset_size
+            tags[code] = tag._replace(value_offset=value)
+        return tags
+
+    def value(self, tag: TiffTag) -> bytes:
+        """Return the raw bytes of the value of `tag`."""
+        return self._read(tag.value_offset, tag.nbytes)
+
+    def description(self, ifd: int = 0) -> bytes | None:
+        """Return the ImageDescription of IFD number `ifd` (None if it has none)."""
+        tag = self.tags(ifd).get(IMAGE_DESCRIPTION)
+        if tag is None:
+            return None
+        desc = self.value(tag)
+        return desc[:-1] if desc.endswith(b"\0") else desc
+
+    def descriptions(self) -> Iterator[tuple[int, bytes]]:
+        """Yield (IFD number, ImageDescription) for all IFDs with a description."""
+        ifd = 0
+        while self.has_ifd(ifd):
+            if (desc := self.description(ifd)) is not None:
+                yield ifd, desc
+            ifd += 1
+
+    def ome_xml(self) -> bytes:
+        """Return the first ImageDescription that holds OME-XML.
+
+        The OME-XML is normally in the first IFD, but some writers put it later.
+        """
+        return self._find_ome()[1]
+
+    def ome_ifd(self) -> int:
+        """Return the number of the first IFD whose ImageDescription is OME-XML."""
+        return self._find_ome()[0]
+
+    def _find_ome(self) -> tuple[int, bytes]:
+        for ifd, desc in self.descriptions():
+            if _OME_TAG.search(desc):
+                return ifd, desc
+        raise ValueError(f"No OME metadata found in file: {self._name}")
+
+    def close(self) -> None:
+        """Release the memory map (or buffer) of the file."""
+        if isinstance(self._buf, memoryview):
+            self._buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _read(self, offset: int, size: int) -> bytes:
+        """Return (at most) `size` bytes of the file, from `offset`."""
+        if self._fh is None:
+            return bytes(self._buf[offset : offset + size])
+        self._fh.seek(offset)
+        return self._fh.read(size)
+
+    def _unpack(self, strct: Struct, offset: int) -> int:
+        data = self._read(offset, strct.size)
+        # (a truncated file reads as 0: no IFD, or no more IFDs)
+        return int(strct.unpack(data)[0]) if len(data) == strct.size else 0
+
+
+def write_description(
+    path: Path | str, description: bytes, ifd: int | None = None
+) -> None:
+    """Replace the ImageDescription of an IFD of a TIFF file, in place.
+
+    The new description overwrites the old one if it fits in its place.  Otherwise,
+    it is appended to the end of the file, and the offset of the tag is updated.
+    Either way, only the description and its tag entry are written, and the entry
+    is written last, once the description it points to is in place.
+
+    Parameters
+    ----------
+    path : Path | str
+        Path to the TIFF file.
+    description : bytes
+        The new description.
+    ifd : int | None
+        The number of the IFD.  By default, the first IFD whose ImageDescription
+        holds OME-XML.
+    """
+    with TiffHeader(path) as tiff:
+        if ifd is None:
+            ifd = tiff.ome_ifd()
+        tag = tiff.tags(ifd).get(IMAGE_DESCRIPTION)
+        if tag is None:
+            raise ValueError(f"No ImageDescription in IFD {ifd} of file: {path}")
+        offset = tiff._offset
+        size = tiff._size
+
+    value = description + b"\0"
+    with open(path, "r+b") as fh:
+        if len(value) <= offset.size:
+            # small enough to be stored in the entry itself
+            field = value.ljust(offset.size, b"\0")
+        else:
+            if tag.nbytes > offset.size and len(value) <= tag.nbytes:
+                value_offset = tag.value_offset
+                fh.seek(value_offset)
+                fh.write(value.ljust(tag.nbytes, b"\0"))
+            else:
+                # append it, keeping values aligned to a word boundary
+                value_offset = size + (-size % offset.size)
+                fh.seek(size)
+                fh.write(b"\0" * (value_offset - size) + value)
+                # (the value must be on disk before the entry points to it)
+                fh.flush()
+                os.fsync(fh.fileno())
+            field = offset.pack(value_offset)
+        # the count and the value (or its offset) are adjacent in the tag entry, and
+        # written together, so the entry is never left half-updated
+        fh.seek(tag.entry_offset + 4)
+        fh.write(offset.pack(len(value)) + field)
+
+
+def _mmap(fh: BinaryIO) -> mmap.mmap:
+    return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
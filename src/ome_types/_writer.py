@@ -0,0 +1,296 @@
+"""Streaming XML writers, for the regular and canonical output of `to_xml`."""
+
+from __future__ import annotations
+
+import re
+from functools import cache
+from typing import TYPE_CHECKING, TextIO
+from xml.sax.handler import ContentHandler
+from xml.sax.saxutils import XMLGenerator, escape
+
+from xsdata.formats.dataclass.serializers.mixins import XmlWriter
+
+if TYPE_CHECKING:
+    from typing import Any
+    from xml.sax.xmlreader import AttributesNSImpl
+
+_WHITESPACE = " \t\n\r"
+# escaped like lxml does, in addition to &, < and >
+_TEXT_ENTITIES = {"\r": "&#13;"}
+_ATTR_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+
+
+class StreamingXmlWriter(XmlWriter):
+    """Xml writer that writes straight to the output stream, as events come.
+
+    xsdata's `LxmlEventWriter` builds an lxml tree of the whole document, and
+    indents it with `etree.indent` before writing it out.  This produces the same
+    output without holding the document in memory: whitespace-only text between
+    tags is buffered until the next tag shows whether it must be replaced by
+    indentation (following the rules of `etree.indent`).
+    """
+
+    def build_handler(self) -> _IndentingXMLGenerator:
+        return _IndentingXMLGenerator(
+            self.output, self.config.encoding, self.config.indent or ""
+        )
+
+
+class _IndentingXMLGenerator(XMLGenerator):
+    """XMLGenerator that indents like `lxml.etree.indent` and quotes like lxml."""
+
+    if TYPE_CHECKING:
+        # private members of XMLGenerator
+        _undeclared_ns_maps: list[tuple[str | None, str]]
+        _pending_start_element: bool
+
+        def _write(self, text: str) -> None: ...
+        def _qname(self, name: tuple[str | None, str]) -> str: ...
+        def _finish_pending_start_element(self) -> None: ...
+
+    def __init__(self, out: Any, encoding: str, indent: str) -> None:
+        super().__init__(out, encoding, short_empty_elements=True)
+        self._indent = indent
+        self._level = 0
+        # text seen since the last tag, and whether that tag was a start tag
+        self._text: list[str] = []
+        self._after_start = False
+
+    def startElementNS(
+        self, name: tuple[str | None, str], qname: str | None, attrs: AttributesNSImpl
+    ) -> None:
+        # the text before a child is either the text of its parent (if the previous
+        # tag was the start of the parent) or the tail of its previous sibling
+        self._flush_text(self._level or None)
+        self._finish_pending_start_element()
+        self._write("<" + self._qname(name))
+        for prefix, uri in self._undeclared_ns_maps:
+            if prefix == "xml":
+                continue  # reserved, never declared
+            self._write(f' xmlns:{prefix}="{uri}"' if prefix else f' xmlns="{uri}"')
+        self._undeclared_ns_maps = []
+        for attr_name, value in attrs.items():
+            value = escape(value, _ATTR_ENTITIES)
+            self._write(f' {self._qname(attr_name)}="{value}"')
+        self._pending_start_element = True
+        self._level += 1
+        self._after_start = True
+
+    def endElementNS(self, name: tuple[str | None, str], qname: str | None) -> None:
+        self._level -= 1
+        if self._after_start:
+            # a leaf: its text is kept as is
+            self._flush_text(None)
+        else:
+            # the tail of the last child: dedented to the level of this element
+            self._flush_text(self._level)
+        super().endElementNS(name, qname)
+        self._after_start = False
+
+    def characters(self, content: str) -> None:
+        if content:
+            self._text.append(content)
+
+    def endDocument(self) -> None:
+        self._flush_text(None)
+        if self._indent:
+            self._write("\n")
+        super().endDocument()
+
+    def _flush_text(self, level: int | None) -> None:
+        """Write the buffered text, replaced by indentation for `level` if blank."""
+        text = "".join(self._text)
+        self._text = []
+        if level is not None and self._indent and not text.strip(_WHITESPACE):
+            text = "\n" + self._indent * level
+        if text:
+            self._finish_pending_start_element()
+            self._write(escape(text, _TEXT_ENTITIES))
+
+
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+
+
+class CanonicalXmlWriter(XmlWriter):
+    """Xml writer for the canonical output of `to_xml(..., canonicalize=True)`.
+
+    The canonical form used to be made by running the output through C14N 2.0
+    (`canonicalize(..., strip_text=True)`), then re-parsing it with minidom to
+    pretty-print it.  This writes the same bytes directly, as events come: sorted
+    attributes, only the namespace declarations that are used, stripped text, and
+    minidom's indentation.
+    """
+
+    def build_handler(self) -> _CanonicalHandler:
+        return _CanonicalHandler(self.output, self.config.indent or "")
+
+
+class _CanonicalHandler(ContentHandler):
+    """ContentHandler writing C14N 2.0 output, pretty-printed like minidom."""
+
+    def __init__(self, out: TextIO, indent: str) -> None:
+        super().__init__()
+        self._out = out
+        self._indent = indent
+        self._text_entities, self._attr_entities = _minidom_entities()
+        # (uri, prefix) declared by the document, and in the output, per element
+        self._ns_stack: list[list[tuple[str, str]]] = [[]]
+        self._declared_stack: list[list[tuple[str, str]]] = [[(XML_NS, "xml")]]
+        self._preserve_space = [False]
+        self._text: list[str] = []
+        # per open element: its qname, and whether its start tag is still open
+        # (`<tag attrs`, without `>`) with no children written yet
+        self._open: list[tuple[str, bool]] = []
+        # text that is the first child of the open element, not written yet
+        self._first_text: str | None = None
+        self._after_start = False
+        self._out.write('<?xml version="1.0" ?>\n')
+
+    def startPrefixMapping(self, prefix: str | None, uri: str) -> None:
+        self._flush_text(len(self._open))
+        self._ns_stack[-1].append((uri, prefix or ""))
+
+    def endPrefixMapping(self, prefix: str | None) -> None:
+        pass
+
+    def startElementNS(
+        self, name: tuple[str | None, str], qname: str | None, attrs: Any
+    ) -> None:
+        self._flush_text(len(self._open))
+        self._start_child()
+
+        new_namespaces: list[tuple[str, str]] = []
+        self._declared_stack.append(new_namespaces)
+        names = {name, *attrs}
+        qnames = {n: self._qname(n) for n in sorted(names, key=_sort_key)}
+        attr_list = sorted(
+            ("xmlns:" + prefix if prefix else "xmlns", uri)
+            for uri, prefix in new_namespaces
+        )
+        for key in sorted(attrs, key=_clark):
+            attr_list.append((qnames[key] if key[0] else key[1], attrs[key]))
+
+        space = attrs.get((XML_NS, "space"))
+        self._preserve_space.append(
+            space == "preserve" if space else self._preserve_space[-1]
+        )
+        tag = qnames[name]
+        self._write(self._indent * len(self._open) + "<" + tag)
+        for key, value in attr_list:
+            self._write(f' {key}="{escape(value, self._attr_entities)}"')
+        self._open.append((tag, True))
+        self._ns_stack.append([])
+        self._after_start = True
+
+    def endElementNS(self, name: tuple[str | None, str], qname: str | None) -> None:
+        self._flush_text(None if self._after_start else len(self._open) - 1)
+        self._after_start = False
+        tag, empty = self._open.pop()
+        if self._first_text is not None:
+            # a single text child is written inline
+            text, self._first_text = self._first_text, None
+            self._write(f">{escape(text, self._text_entities)}</{tag}>\n")
+        elif empty:
+            self._write("/>\n")
+        else:
+            self._write(f"{self._indent * len(self._open)}</{tag}>\n")
+        self._preserve_space.pop()
+        self._declared_stack.pop()
+        self._ns_stack.pop()
+
+    def characters(self, content: str) -> None:
+        self._text.append(content)
+
+    def _flush_text(self, level: int | None) -> None:
+        """Handle the text seen since the last tag, as a child of the open element.
+
+        Whitespace is stripped, unless in the scope of xml:space="preserve", where
+        blank text around child elements is replaced by the indentation for `level`
+        (as the pretty-printed XML that used to be canonicalized had).
+        """
+        text = "".join(self._text)
+        self._text = []
+        if not self._preserve_space[-1]:
+            text = text.strip()
+        elif level is not None and self._indent and not text.strip(_WHITESPACE):
+            text = "\n" + self._indent * level
+        if not text or not self._open:
+            return
+        if self._open[-1][1] and self._first_text is None:
+            # may be the only child: wait and see
+            self._first_text = text
+            return
+        self._start_child()
+        indent = self._indent * len(self._open)
+        self._write(escape(f"{indent}{text}\n", self._text_entities))
+
+    def _start_child(self) -> None:
+        """Close the start tag of the open element, before writing a child."""
+        if self._open and self._open[-1][1]:
+            self._open[-1] = (self._open[-1][0], False)
+            self._write(">\n")
+            if self._first_text is not None:
+                text, self._first_text = self._first_text, None
+                indent = self._indent * len(self._open)
+                self._write(escape(f"{indent}{text}\n", self._text_entities))
+
+    def _qname(self, name: tuple[str | None, str]) -> str:
+        """Return the prefixed name of `name`, declaring its namespace if needed.
+
+        (Following `xml.etree.ElementTree.C14NWriterTarget._qname`.)
+        """
+        uri, tag = name[0] or "", name[1]
+        prefixes_seen = set()
+        for declared in reversed(self._declared_stack):
+            for u, prefix in declared:
+                if u == uri and prefix not in prefixes_seen:
+                    return f"{prefix}:{tag}" if prefix else tag
+                prefixes_seen.add(prefix)
+        if not uri and "" not in prefixes_seen:
+            return tag
+        for namespaces in reversed(self._ns_stack):
+            for u, prefix in namespaces:
+                if u == uri:
+                    self._declared_stack[-1].append((uri, prefix))
+                    return f"{prefix}:{tag}" if prefix else tag
+        if not uri:
+            return tag
+        raise ValueError(f"Namespace {uri!r} is not declared in scope")
+
+    def _write(self, text: str) -> None:
+        self._out.write(text)
+
+
+def _clark(name: tuple[str | None, str]) -> str:
+    return f"{{{name[0]}}}{name[1]}" if name[0] else name[1]
+
+
+def _sort_key(name: tuple[str | None, str]) -> list[str]:
+    return _clark(name).split("}", 1)
+
+
+@cache
+def _minidom_entities() -> tuple[dict[str, str], dict[str, str]]:
+    """Return how minidom escapes characters in text and attributes.
+
+    Beyond & and <, this changed across Python versions (e.g. whether quotes are
+    escaped in text, and whitespace in attributes), and the canonical output has
+    to match what minidom does on the running Python.
+    """
+    from xml.dom import minidom
+
+    text_entities: dict[str, str] = {}
+    attr_entities: dict[str, str] = {}
+    doc = minidom.Document()
+    for char in '">\t\n\r':
+        elem = doc.createElement("a")
+        elem.setAttribute("b", char)
+        elem.appendChild(doc.createTextNode(char))
+        match = re.fullmatch(r'<a b="(.*)">(.*)</a>', elem.toxml(), re.DOTALL)
+        if match is None:  # pragma: no cover
+            raise RuntimeError("Unexpected minidom output")
+        if match[1] != char:
+            attr_entities[char] = match[1]
+        if match[2] != char:
+            text_entities[char] = match[2]
+    return text_entities, attr_entities
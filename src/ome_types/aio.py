@@ -0,0 +1,168 @@
+"""Asynchronous (asyncio) versions of `from_xml`, `from_tiff` and `validate_xml`.
+
+Blocking work is run off the event loop: TIFF headers are read on a small thread
+pool dedicated to I/O, and XML is parsed (and validated) on an executor that can be
+configured with `configure` or per call, e.g. a `ProcessPoolExecutor` to use
+several cores.  The number of operations that run at once is limited per event
+loop, so that a service handling many requests doesn't queue unbounded work.
+
+Cancelling one of these coroutines cancels the work it is waiting for if it has
+not started yet; work that is already running in a thread or process is left to
+finish, and its result is discarded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+from ome_types import _conversion
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from pathlib import Path
+    from typing import Any, Callable, TypeVar
+
+    from ome_types._conversion import XMLSource
+    from ome_types.model import OME
+
+    T = TypeVar("T")
+
+__all__ = ["configure", "from_tiff", "from_xml", "validate_xml"]
+
+# default maximum number of operations that run at once, per event loop
+DEFAULT_MAX_CONCURRENCY = 2 * (os.cpu_count() or 1)
+
+_executor: Executor | None = None
+_max_concurrency = DEFAULT_MAX_CONCURRENCY
+_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+_io_pool: ThreadPoolExecutor | None = None
+_io_pool_lock = threading.Lock()
+# default of `configure` arguments, to leave settings unchanged
+_UNSET: Any = object()
+
+
+def configure(
+    *, executor: Executor | None = _UNSET, max_concurrency: int | None = None
+) -> None:
+    """Set the defaults used by the functions of this module.
+
+    Settings that are not passed are left unchanged.
+
+    Parameters
+    ----------
+    executor : Executor | None
+        The executor that XML is parsed and validated on, unless one is passed to
+        a function.  None (the initial setting) uses the default executor of the
+        event loop (a thread pool).
+    max_concurrency : int | None
+        The maximum number of operations that run at once in each event loop
+        (others wait for their turn).  None leaves it unchanged (initially, twice
+        the number of CPUs).  Only applies to event loops that haven't used this
+        module yet.
+    """
+    global _executor, _max_concurrency
+    if max_concurrency is not None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        _max_concurrency = max_concurrency
+    if executor is not _UNSET:
+        _executor = executor
+
+
+async def from_xml(
+    source: XMLSource, *, executor: Executor | None = None, **kwargs: Any
+) -> OME:
+    """Asynchronous version of `ome_types.from_xml`.
+
+    Parameters
+    ----------
+    source : Path | str | bytes | BinaryIO
+        Passed to `from_xml`.  It must be picklable (i.e. not an open file) if the
+        executor is a process pool.
+    executor : Executor | None
+        The executor to parse on.  By default, the one set with `configure`.
+    **kwargs : Any
+        Passed to `from_xml`.
+    """
+    return await _run(executor, partial(_conversion.from_xml, source, **kwargs))
+
+
+async def from_tiff(
+    path: Path | str,
+    *,
+    executor: Executor | None = None,
+    validate: bool | None = None,
+    parser_kwargs: _conversion.ParserKwargs | None = None,
+) -> OME:
+    """Asynchronous version of `ome_types.from_tiff`.
+
+    The OME-XML is read from the TIFF header on a thread pool dedicated to I/O,
+    then parsed on `executor` (by default, the one set with `configure`).
+    """
+    async with _semaphore():
+        xml = await asyncio.get_running_loop().run_in_executor(
+            _get_io_pool(), _conversion.tiff2xml, path
+        )
+        parse = partial(
+            _conversion.from_xml, xml, validate=validate, parser_kwargs=parser_kwargs
+        )
+        return await _run_now(executor, parse)
+
+
+async def validate_xml(
+    xml: XMLSource,
+    schema: Path | str | None = None,
+    *,
+    executor: Executor | None = None,
+    warn_on_schema_update: bool = True,
+) -> None:
+    """Asynchronous version of `ome_types.validate_xml`.
+
+    Raises a `ValidationError` if `xml` is not valid.  Unlike `validate_xml`, the
+    parsed document is not returned (it can't be sent back from another process).
+    """
+    validate = partial(_validate, xml, schema, warn_on_schema_update)
+    await _run(executor, validate)
+
+
+def _validate(
+    xml: XMLSource, schema: Path | str | None, warn_on_schema_update: bool
+) -> None:
+    _conversion.validate_xml(xml, schema, warn_on_schema_update=warn_on_schema_update)
+
+
+async def _run(executor: Executor | None, func: Callable[[], T]) -> T:
+    """Run `func` on `executor`, once the concurrency limit allows it."""
+    async with _semaphore():
+        return await _run_now(executor, func)
+
+
+async def _run_now(executor: Executor | None, func: Callable[[], T]) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or _executor, func)
+
+
+def _semaphore() -> asyncio.Semaphore:
+    """Return the semaphore that limits concurrency in the running event loop."""
+    loop = asyncio.get_running_loop()
+    if (semaphore := _semaphores.get(loop)) is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(_max_concurrency)
+    return semaphore
+
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    global _io_pool
+    with _io_pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(
+                min(32, DEFAULT_MAX_CONCURRENCY), thread_name_prefix="ome-types-io"
+            )
+        return _io_pool
@@ -101,4 +101,12 @@ def __getattr__(name: str) -> Any:
         from ome_types._autogenerated.ome_2016_06 import ROI
 
         return ROI.Union
+    if name == "PlaneTable":
+        from ome_types.model._plane_table import PlaneTable
+
+        return PlaneTable
+    if name == "PlaneLocator":
+        from ome_types.model._plane_locator import PlaneLocator
+
+        return PlaneLocator
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,127 @@
+"""Vectorized index of the TIFF file and IFD holding each plane of a `Pixels`."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError(
+        "NumPy is required to use PlaneLocator in ome-types. "
+        "Install with `pip install ome-types[numpy]`."
+    ) from None
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from ome_types._autogenerated.ome_2016_06 import Pixels, TiffData
+
+__all__ = ["PlaneLocator"]
+
+# Value of `ifds` and `file_indices` for planes that no TiffData block covers
+UNMAPPED = -1
+
+
+class PlaneLocator:
+    """Maps the (z, c, t) index of each plane of a `Pixels` to its file and IFD.
+
+    The index is built once from `Pixels.tiff_data_blocks`, following the rules of
+    the OME-TIFF specification: each `TiffData` block covers `plane_count` planes,
+    starting at plane (`first_z`, `first_c`, `first_t`) and IFD `ifd`, with planes
+    and IFDs advancing together in the `dimension_order` of the `Pixels`.  If
+    `plane_count` is omitted, a block covers a single plane if its `ifd` was given,
+    and all remaining planes otherwise.  Later blocks take precedence over earlier
+    ones.  Lookups are then O(1), and can be done in bulk with `locate`.
+
+    Usually obtained with `Pixels.plane_locator()`.
+
+    Attributes
+    ----------
+    files : list[TiffData.UUID | None]
+        The files referenced by the `TiffData` blocks.  None stands for the file
+        that holds the OME-XML itself (a block without a `uuid`).
+    file_indices : np.ndarray
+        Array of shape (size_z, size_c, size_t), with the index in `files` of the
+        file holding each plane, or -1 if the plane is not mapped.
+    ifds : np.ndarray
+        Array of shape (size_z, size_c, size_t), with the IFD holding each plane
+        within its file, or -1 if the plane is not mapped.
+    """
+
+    def __init__(self, pixels: Pixels) -> None:
+        # dimension_order lists dimensions from fastest to slowest varying
+        order = pixels.dimension_order.value[2:]
+        sizes = {"Z": pixels.size_z, "C": pixels.size_c, "T": pixels.size_t}
+        # np.unravel_index wants the slowest varying dimension first
+        linear_shape = tuple(sizes[dim] for dim in reversed(order))
+        zct_axes = tuple(order[::-1].index(dim) for dim in "ZCT")
+        n_planes = pixels.size_z * pixels.size_c * pixels.size_t
+
+        self.files: list[TiffData.UUID | None] = []
+        file_keys: dict[tuple[str, str | None] | None, int] = {}
+        # indexed by linear plane index, then reshaped to (Z, C, T)
+        file_indices = np.full(n_planes, UNMAPPED, dtype=np.int32)
+        ifds = np.full(n_planes, UNMAPPED, dtype=np.int64)
+
+        for td in pixels.tiff_data_blocks:
+            uuid = td.uuid
+            key = None if uuid is None else (uuid.value, uuid.file_name)
+            if key not in file_keys:
+                file_keys[key] = len(self.files)
+                self.files.append(uuid)
+
+            first = {"Z": td.first_z, "C": td.first_c, "T": td.first_t}
+            if any(first[dim] >= sizes[dim] for dim in "ZCT"):
+                continue
+            start = int(
+                np.ravel_multi_index([first[d] for d in order[::-1]], linear_shape)
+            )
+            if td.plane_count is not None:
+                count = td.plane_count
+            elif "ifd" in td.model_fields_set:
+                count = 1
+            else:
+                count = n_planes - start
+            stop = min(start + count, n_planes)
+            file_indices[start:stop] = file_keys[key]
+            ifds[start:stop] = np.arange(td.ifd, td.ifd + stop - start)
+
+        self.file_indices = _to_zct(file_indices, linear_shape, zct_axes)
+        self.ifds = _to_zct(ifds, linear_shape, zct_axes)
+
+    def __getitem__(
+        self, zct: tuple[int, int, int]
+    ) -> tuple[TiffData.UUID | None, int]:
+        """Return the file (see `files`) and IFD holding plane (z, c, t).
+
+        Raises a KeyError if no `TiffData` block covers the plane.
+        """
+        file_index = int(self.file_indices[zct])
+        if file_index == UNMAPPED:
+            raise KeyError(f"No TiffData for plane (z, c, t) = {zct}")
+        return self.files[file_index], int(self.ifds[zct])
+
+    def locate(self, zct: npt.ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        """Look up many planes at once.
+
+        Parameters
+        ----------
+        zct : ArrayLike
+            Array of shape (N, 3), with the (z, c, t) index of each plane.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The indices in `files` and the IFDs of the N planes (-1 for planes that
+            are not mapped).
+        """
+        z, c, t = np.asarray(zct, dtype=np.intp).reshape(-1, 3).T
+        return self.file_indices[z, c, t], self.ifds[z, c, t]
+
+
+def _to_zct(
+    linear: np.ndarray, shape: tuple[int, ...], zct_axes: tuple[int, ...]
+) -> np.ndarray:
+    """Reshape an array indexed by linear plane index into a (Z, C, T) array."""
+    return np.ascontiguousarray(linear.reshape(shape).transpose(zct_axes))
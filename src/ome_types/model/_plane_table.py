@@ -0,0 +1,165 @@
+"""Columnar (NumPy) representation of the planes of a `Pixels` object."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any, ClassVar, Union, overload
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError(
+        "NumPy is required to use PlaneTable in ome-types. "
+        "Install with `pip install ome-types[numpy]`."
+    ) from None
+
+from ome_types._autogenerated.ome_2016_06 import Plane, UnitsLength, UnitsTime
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    import numpy.typing as npt
+
+__all__ = ["PlaneTable"]
+
+Units = Union[UnitsLength, UnitsTime]
+
+# Value of a unit column for planes that don't set the unit (the default applies)
+UNSET = -1
+
+_INDICES = ("the_z", "the_c", "the_t")
+# (value column, unit column, units enum)
+_MEASURES: tuple[tuple[str, str, type[Units]], ...] = (
+    ("delta_t", "delta_t_unit", UnitsTime),
+    ("exposure_time", "exposure_time_unit", UnitsTime),
+    ("position_x", "position_x_unit", UnitsLength),
+    ("position_y", "position_y_unit", UnitsLength),
+    ("position_z", "position_z_unit", UnitsLength),
+)
+_UNITS: dict[str, list[Units]] = {unit: list(enum) for _, unit, enum in _MEASURES}
+_CODES: dict[str, dict[Units, int]] = {
+    unit: {member: code for code, member in enumerate(members)}
+    for unit, members in _UNITS.items()
+}
+
+PLANE_DTYPE = np.dtype(
+    [
+        *((name, "<u4") for name in _INDICES),
+        *((value, "<f8") for value, _, _ in _MEASURES),
+        *((unit, "i1") for _, unit, _ in _MEASURES),
+    ]
+)
+
+
+class PlaneTable:
+    """Columnar representation of the planes of a `Pixels` object.
+
+    Each plane is one row of a NumPy structured array (`PlaneTable.dtype`), which
+    is far more compact than a list of `Plane` models for images with many planes.
+    Measurements that a plane doesn't set (`delta_t`, `exposure_time`,
+    `position_x/y/z`) are stored as NaN.  Each unit column holds the index of the
+    unit in its enum (`UnitsTime` or `UnitsLength`), or -1 if the plane doesn't
+    set it; use `units()` to decode a unit column.
+
+    Planes with a `hash_sha1` or `annotation_refs` cannot be represented.
+
+    Parameters
+    ----------
+    data : np.ndarray | None
+        A structured array with dtype `PlaneTable.dtype`.  If None, the table is
+        empty.
+    """
+
+    dtype: ClassVar[np.dtype] = PLANE_DTYPE
+
+    def __init__(self, data: npt.ArrayLike | None = None) -> None:
+        data = np.zeros(0, PLANE_DTYPE) if data is None else np.asarray(data)
+        if data.dtype != PLANE_DTYPE or data.ndim != 1:
+            raise ValueError(
+                f"PlaneTable data must be a 1D array with dtype {PLANE_DTYPE}"
+            )
+        self.data = data
+
+    @classmethod
+    def from_planes(cls, planes: Iterable[Plane | Mapping[str, Any]]) -> PlaneTable:
+        """Build a table from `Plane` models, or mappings of their fields.
+
+        For mappings, the keys that are present are considered to be set.
+        """
+        rows: list[tuple[Mapping[str, Any], Iterable[str]]] = []
+        for plane in planes:
+            if isinstance(plane, Plane):
+                fields: Mapping[str, Any] = plane.__dict__
+                rows.append((fields, plane.model_fields_set))
+            else:
+                fields = plane
+                rows.append((fields, fields.keys()))
+            if fields.get("hash_sha1") or fields.get("annotation_refs"):
+                raise ValueError(
+                    "Planes with a hash_sha1 or annotation_refs cannot be "
+                    "represented in a PlaneTable"
+                )
+
+        data = np.empty(len(rows), PLANE_DTYPE)
+        for name in _INDICES:
+            data[name] = [fields[name] for fields, _ in rows]
+        for value, unit, _ in _MEASURES:
+            data[value] = [
+                math.nan if (v := fields.get(value)) is None else v
+                for fields, _ in rows
+            ]
+            codes = _CODES[unit]
+            data[unit] = [
+                codes[fields[unit]] if unit in set_fields else UNSET
+                for fields, set_fields in rows
+            ]
+        return cls(data)
+
+    def to_planes(self) -> list[Plane]:
+        """Return the planes in this table as a list of `Plane` models."""
+        columns = {name: self.data[name].tolist() for name in PLANE_DTYPE.fields or ()}
+        planes = []
+        for i in range(len(self.data)):
+            kwargs: dict[str, Any] = {name: columns[name][i] for name in _INDICES}
+            for value, unit, _ in _MEASURES:
+                if not math.isnan(v := columns[value][i]):
+                    kwargs[value] = v
+                if (code := columns[unit][i]) != UNSET:
+                    kwargs[unit] = _UNITS[unit][code]
+            planes.append(Plane(**kwargs))
+        return planes
+
+    def units(self, column: str) -> list[Units]:
+        """Decode the unit column `column`, filling in the default unit if unset."""
+        members = _UNITS[column]
+        default = Plane.model_fields[column].default
+        return [default if c == UNSET else members[c] for c in self.data[column]]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[Plane]:
+        yield from self.to_planes()
+
+    @overload
+    def __getitem__(self, key: int) -> Plane: ...
+    @overload
+    def __getitem__(self, key: str) -> np.ndarray: ...
+    @overload
+    def __getitem__(self, key: slice | np.ndarray) -> PlaneTable: ...
+    def __getitem__(self, key: Any) -> Any:
+        """Return a plane by index, a column by name, or a sub-table."""
+        if isinstance(key, str):
+            return self.data[key]
+        if isinstance(key, (int, np.integer)):
+            return PlaneTable(self.data[[int(key)]]).to_planes()[0]
+        return PlaneTable(self.data[key])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PlaneTable):
+            return NotImplemented
+        # compare bytes, so that unset (NaN) values compare equal
+        return self.data.tobytes() == other.data.tobytes()
+
+    def __repr__(self) -> str:
+        return f"PlaneTable(<{len(self)} planes>)"
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import copy
+import sys
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable
 from xml.etree.ElementTree import QName
@@ -29,6 +33,22 @@ class XmlContext(context.XmlContext):
         super().__init__(
             element_name_generator, attribute_name_generator, "pydantic-basemodel"
         )
+        self._xsi_lock = threading.Lock()
+
+    # xsdata clears and refills xsi_cache in place, so another thread sharing this
+    # context could see it half-built.  Instead, build it on a scratch copy and
+    # swap it in once complete.
+    def build_xsi_cache(self) -> None:
+        if len(sys.modules) == self.sys_modules:
+            return
+        with self._xsi_lock:
+            if len(sys.modules) == self.sys_modules:
+                return
+            scratch = copy.copy(self)
+            scratch.xsi_cache = defaultdict(list)
+            super(XmlContext, scratch).build_xsi_cache()
+            self.xsi_cache = scratch.xsi_cache
+            self.sys_modules = scratch.sys_modules
 
 
 class SerializerConfig(config.SerializerConfig):
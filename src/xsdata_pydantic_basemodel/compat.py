@@ -81,13 +81,22 @@ class PydanticBaseModel(Dataclasses):
     def derived_element(self) -> type:
         return DerivedElement
 
+    def __init__(self) -> None:
+        # models whose schema is known to be complete.  xsdata asks `is_model` in
+        # hot parse and serialize loops, so once a class is ready, it's a set lookup.
+        self._ready_models: set[type] = set()
+
     def is_model(self, obj: Any) -> bool:
+        clazz = obj if isinstance(obj, type) else type(obj)
+        if clazz in self._ready_models:
+            return True
         with suppress(Exception):
-            clazz = obj if isinstance(obj, type) else type(obj)
             if issubclass(clazz, BaseModel) and clazz != BaseModel:
-                rebuild = getattr(clazz, "model_rebuild", None)
-                if callable(rebuild):
-                    rebuild()
+                # model_rebuild is a no-op for classes that are already complete,
+                # and raises if forward references still can't be resolved
+                if not clazz.__pydantic_complete__:
+                    clazz.model_rebuild()
+                self._ready_models.add(clazz)
                 return True
         return False
 
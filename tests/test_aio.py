@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ome_types import _conversion, aio, from_tiff, from_xml
+from ome_types._conversion import ValidationError
+
+DATA = Path(__file__).parent / "data"
+
+
+def test_aio() -> None:
+    xml = DATA / "example.ome.xml"
+    tiff = DATA / "ome.tiff"
+
+    async def main() -> None:
+        results = await asyncio.gather(
+            aio.from_xml(xml), aio.from_tiff(tiff), aio.validate_xml(xml)
+        )
+        assert results == [from_xml(xml), from_tiff(tiff), None]
+
+        with pytest.raises(ValidationError):
+            await aio.validate_xml(DATA / "invalid_xml_annotation.ome.xml")
+
+        with ThreadPoolExecutor(1) as executor:
+            assert await aio.from_xml(xml, executor=executor) == results[0]
+
+    asyncio.run(main())
+
+
+def test_aio_concurrency_and_cancellation(monkeypatch: pytest.MonkeyPatch) -> None:
+    release = threading.Event()
+    running = []
+
+    def _from_xml(source: str) -> str:
+        running.append(source)
+        release.wait(5)
+        return source
+
+    monkeypatch.setattr(_conversion, "from_xml", _from_xml)
+    monkeypatch.setattr(aio, "_max_concurrency", 2)
+
+    async def main() -> None:
+        tasks = [asyncio.create_task(aio.from_xml(str(i))) for i in range(4)]
+        await asyncio.sleep(0.1)
+        # only two run at once, and waiting ones can be cancelled
+        assert sorted(running) == ["0", "1"]
+        tasks[3].cancel()
+        release.set()
+        assert await asyncio.gather(*tasks[:3]) == ["0", "1", "2"]
+        assert tasks[3].cancelled()
+        assert sorted(running) == ["0", "1", "2"]
+
+    asyncio.run(main())
+
+    with pytest.raises(ValueError, match="max_concurrency must be"):
+        aio.configure(max_concurrency=0)
+
+
+def test_configure(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(aio, "_executor", None)
+    monkeypatch.setattr(aio, "_max_concurrency", aio.DEFAULT_MAX_CONCURRENCY)
+    with ThreadPoolExecutor(1) as executor:
+        aio.configure(executor=executor)
+        # settings that aren't passed are left unchanged
+        aio.configure(max_concurrency=3)
+        assert aio._executor is executor
+        assert aio._max_concurrency == 3
+        aio.configure(executor=None)
+        assert aio._executor is None
+        assert aio._max_concurrency == 3
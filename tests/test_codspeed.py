@@ -6,7 +6,16 @@ from typing import TYPE_CHECKING
 
 import pytest
 
-from ome_types import OME, from_tiff, from_xml, to_dict, to_xml
+from ome_types import (
+    OME,
+    OMEParser,
+    _conversion,
+    from_tiff,
+    from_xml,
+    to_dict,
+    to_xml,
+)
+from xsdata_pydantic_basemodel.bindings import XmlContext
 
 if all(x not in {"--codspeed", "tests/test_codspeed.py"} for x in sys.argv):
     pytest.skip("use --codspeed to run benchmarks", allow_module_level=True)
@@ -20,13 +29,28 @@ TIFF = DATA / "ome.tiff"  # 1KB
 SMALL = DATA / "multi-channel.ome.xml"  # 1KB
 MED = DATA / "two-screens-two-plates-four-wells.ome.xml"  # 16KB
 LARGE = DATA / "OverViewScan2-aics.ome.xml"  # 972KB
+LARGE_TAXONOMY = DATA / "folders-larger-taxonomy.ome.xml"  # 267KB
 XML = [SMALL, MED, LARGE]
+# one file per legacy (pre-2016-06) namespace
+LEGACY = {
+    "2008-09": DATA / "2008_instrument.ome.xml",
+    "2015-01": DATA / "seq0000xy01c1.ome.xml",
+}
 
 
 @pytest.mark.benchmark
+@pytest.mark.parametrize("streaming", [False, True], ids=["tree", "streaming"])
 @pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
-def test_time_from_xml(file: Path) -> None:
-    _ = from_xml(file)
+def test_time_from_xml(file: Path, streaming: bool) -> None:
+    # in codspeed's memory mode, the "streaming" variant reports the peak memory
+    # saved by not building a full ElementTree before parsing.
+    _ = from_xml(file, streaming=streaming)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
+def test_time_from_xml_trusted(file: Path) -> None:
+    _ = from_xml(file, validate=False, trust=True)
 
 
 @pytest.mark.parametrize("file", XML, ids=["small", "med", "large"])
@@ -35,6 +59,43 @@ def test_time_to_xml(file: Path, benchmark: BenchmarkFixture) -> None:
     benchmark(lambda: to_xml(ome))
 
 
+@pytest.mark.parametrize("file", [MED, LARGE], ids=["med", "large"])
+def test_time_to_xml_canonical(file: Path, benchmark: BenchmarkFixture) -> None:
+    ome = from_xml(file)
+    benchmark(lambda: to_xml(ome, canonicalize=True))
+
+
+@pytest.mark.parametrize("file", [LARGE, LARGE_TAXONOMY], ids=["large", "taxonomy"])
+def test_time_link_refs(file: Path, benchmark: BenchmarkFixture) -> None:
+    # the single pass that indexes ids and links references (on creation, copy
+    # and unpickle of OME objects)
+    ome = from_xml(file)
+    benchmark(ome._link_refs)
+
+
+@pytest.mark.parametrize("warm", [False, True], ids=["cold", "warm"])
+def test_time_small_xml_latency(warm: bool, benchmark: BenchmarkFixture) -> None:
+    # a reused OMEParser keeps its XmlContext, so class metadata is built only once
+    if warm:
+        parser = OMEParser()
+        parser.from_xml(SMALL)
+        benchmark(lambda: parser.from_xml(SMALL))
+    else:
+        benchmark(lambda: from_xml(SMALL, parser_kwargs={"context": XmlContext()}))
+
+
+def test_time_is_model(benchmark: BenchmarkFixture) -> None:
+    # xsdata calls is_model for every class in hot parse/serialize loops
+    # (e.g. ~10k times while parsing and serializing LARGE)
+    from ome_types import model
+    from xsdata_pydantic_basemodel.compat import class_types
+
+    class_type = class_types.get_type("pydantic-basemodel")
+    classes = [c for c in vars(model).values() if isinstance(c, type)]
+
+    benchmark(lambda: [class_type.is_model(c) for c in classes])
+
+
 @pytest.mark.benchmark
 def test_time_from_tiff() -> None:
     _ = from_tiff(TIFF)
@@ -49,3 +110,28 @@ def test_time_from_xml_to_dict(file: Path) -> None:
 def test_time_from_dict_to_ome(file: Path, benchmark: BenchmarkFixture) -> None:
     d = to_dict(file)
     benchmark(lambda: OME(**d))
+
+
+@pytest.mark.parametrize("kind", ["str", "int"])
+def test_time_construct_with_ids(kind: str, benchmark: BenchmarkFixture) -> None:
+    # ID validation runs for every object with an ID
+    from ome_types.model import Experimenter
+
+    ids = [f"Experimenter:{i}" if kind == "str" else i for i in range(100_000)]
+    benchmark(lambda: [Experimenter(id=id_) for id_ in ids])
+
+
+@pytest.mark.parametrize("backend", ["lxml", "xmlschema"])
+def test_time_validate_xml(backend: str, benchmark: BenchmarkFixture) -> None:
+    # per-file validation cost, with the compiled schema already cached
+    validate = getattr(_conversion, f"validate_xml_with_{backend}")
+    validate(SMALL)
+    benchmark(lambda: validate(SMALL))
+
+
+@pytest.mark.parametrize("file", LEGACY.values(), ids=LEGACY.keys())
+def test_time_upgrade_legacy(file: Path, benchmark: BenchmarkFixture) -> None:
+    # per-file upgrade cost, with the compiled stylesheets already cached
+    pytest.importorskip("lxml")
+    _conversion.precompile_transforms()
+    benchmark(lambda: _conversion.ensure_2016(file, as_tree=True))
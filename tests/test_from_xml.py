@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import gc
 import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 from pydantic import ValidationError
 
-from ome_types import from_xml, model
+from ome_types import (
+    OMEParser,
+    OMESerializer,
+    _conversion,
+    from_xml,
+    iter_elements,
+    iter_images,
+    model,
+    to_xml,
+)
 from ome_types._conversion import OME_2016_06_URI, _get_root_ome_type
 
 DATA = Path(__file__).parent / "data"
@@ -30,6 +41,135 @@ def test_from_invalid_xml(invalid_xml: Path, validate: bool) -> None:
             from_xml(invalid_xml, validate=validate)
 
 
+def test_from_xml_streaming(valid_xml: Path) -> None:
+    assert from_xml(valid_xml, streaming=True) == from_xml(valid_xml)
+
+
+def test_from_xml_trusted(valid_xml: Path) -> None:
+    ome = from_xml(valid_xml, trust=True)
+    validated = from_xml(valid_xml)
+    assert ome == validated
+    assert ome.model_fields_set == validated.model_fields_set
+    assert to_xml(ome) == to_xml(validated)
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+@pytest.mark.parametrize("mode", ["lazy", "skip"])
+def test_from_xml_bin_data(mode: str, as_bytes: bool) -> None:
+    path = DATA / "ROI.ome.xml"
+    source = path.read_bytes() if as_bytes else path
+    eager = from_xml(source)
+    ome = from_xml(source, bin_data=mode)
+    blocks = [b for img in ome.images for b in img.pixels.bin_data_blocks]
+    expected = [b for img in eager.images for b in img.pixels.bin_data_blocks]
+    assert blocks
+    for block, exp in zip(blocks, expected):
+        assert block.value == b""
+        assert block.length == exp.length
+        if mode == "lazy":
+            assert block.load_value() == exp.value
+            assert block.value == exp.value
+
+    if mode == "lazy":
+        assert to_xml(from_xml(source, bin_data="lazy")) == to_xml(eager)
+
+    with pytest.raises(ValueError, match="bin_data must be"):
+        from_xml(source, bin_data="never")  # type: ignore[arg-type]
+
+
+def test_from_xml_bin_data_lookalikes() -> None:
+    # only actual BinData elements are stripped: not those in comments, CDATA,
+    # or other namespaces (e.g. in the value of an XMLAnnotation)
+    fake = "<BinData>QUFB</BinData>"
+    xml = (DATA / "ROI.ome.xml").read_text()
+    xml = xml.replace(
+        "</AcquisitionDate>",
+        f"</AcquisitionDate><!-- {fake} --><Description><![CDATA[{fake}]]>"
+        "</Description>",
+        1,
+    ).replace(
+        '<ROI ID="ROI:1">',
+        '<StructuredAnnotations><XMLAnnotation ID="Annotation:0"><Value>'
+        '<x:BinData xmlns:x="urn:other">QUFB</x:BinData></Value></XMLAnnotation>'
+        '</StructuredAnnotations><ROI ID="ROI:1">',
+        1,
+    )
+    eager = from_xml(xml)
+    ome = from_xml(xml.encode(), bin_data="lazy")
+    blocks = ome.images[0].pixels.bin_data_blocks
+    assert [b.load_value() for b in blocks] == [
+        b.value for b in eager.images[0].pixels.bin_data_blocks
+    ]
+    assert ome.images[0].description == fake
+    assert to_xml(ome) == to_xml(eager)
+
+
+def test_streaming_requires_no_tree() -> None:
+    with pytest.raises(ValueError, match="streaming=True cannot be combined"):
+        from_xml(DATA / "example.ome.xml", streaming=True, validate=True)
+
+
+def test_iter_images(valid_xml: Path) -> None:
+    assert list(iter_images(valid_xml)) == from_xml(valid_xml).images
+
+
+def test_iter_images_closes_file(monkeypatch: pytest.MonkeyPatch) -> None:
+    opened: list[io.BufferedReader] = []
+    monkeypatch.setattr(
+        _conversion,
+        "open",
+        lambda *a: opened.append(open(*a)) or opened[-1],
+        raising=False,
+    )
+    # stopping early (and dropping the generator) closes the file
+    images = iter_images(DATA / "example.ome.xml")
+    assert next(images)
+    assert len(opened) == 1
+    assert not opened[0].closed
+    del images
+    gc.collect()
+    assert opened[0].closed
+
+
+def test_iter_elements_lazy_refs() -> None:
+    xml = f"""<OME xmlns="{OME_2016_06_URI}">
+        <Instrument ID="Instrument:0"/>
+        <Image ID="Image:0">
+            <InstrumentRef ID="Instrument:0"/>
+            <Pixels DimensionOrder="XYCZT" ID="Pixels:0" SizeC="1" SizeT="1"
+                SizeX="1" SizeY="1" SizeZ="1" Type="uint8"><MetadataOnly/></Pixels>
+            <AnnotationRef ID="Annotation:0"/>
+        </Image>
+        <StructuredAnnotations>
+            <CommentAnnotation ID="Annotation:0"><Value>hi</Value></CommentAnnotation>
+        </StructuredAnnotations>
+    </OME>"""
+    images = iter_images(xml)
+    image = next(images)
+    assert image.instrument_ref and image.instrument_ref.id == "Instrument:0"
+    assert isinstance(image.instrument_ref.ref, model.Instrument)
+    # the annotation comes later in the document, so isn't available yet
+    assert image.annotation_refs[0].ref is None
+    assert not list(images)
+    assert isinstance(image.annotation_refs[0].ref, model.CommentAnnotation)
+
+    items = list(iter_elements(xml, (model.Instrument, model.Image)))
+    assert [type(i) for i in items] == [model.Instrument, model.Image]
+
+    with pytest.raises(ValueError, match="Not top-level elements"):
+        next(iter_elements(xml, model.Pixels))
+
+
+def test_reusable_parser() -> None:
+    files = [DATA / "example.ome.xml", DATA / "ome_ns.ome.xml", DATA / "spim.ome.xml"]
+    parser, serializer = OMEParser(), OMESerializer()
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(parser.from_xml, files * 4))
+    assert results == [from_xml(f) for f in files * 4]
+    assert model.OME in parser.context.cache
+    assert serializer.to_xml(results[0]) == to_xml(results[0])
+
+
 def test_with_ome_ns() -> None:
     assert from_xml(DATA / "ome_ns.ome.xml").experimenters
 
@@ -56,6 +196,41 @@ def test_get_root_ome_type() -> None:
     assert isinstance(obj, model.XMLAnnotation)
 
 
+def test_sniff_prolog(monkeypatch: pytest.MonkeyPatch) -> None:
+    # sniffing happens in small chunks, and the bytes read are replayed
+    monkeypatch.setattr(_conversion, "_SNIFF_CHUNK", 16)
+    data = (DATA / "example.ome.xml").read_bytes()
+    prolog = _conversion._sniff_prolog(io.BytesIO(data))
+    assert prolog.ns == OME_2016_06_URI
+    assert prolog.root_tag == f"{{{OME_2016_06_URI}}}OME"
+    assert prolog.stream.read(5) + prolog.stream.read() == data
+
+    # a path is opened only once, for both sniffing and parsing
+    opened = []
+    monkeypatch.setattr(
+        _conversion, "open", lambda *a: opened.append(a) or open(*a), raising=False
+    )
+    assert from_xml(str(DATA / "example.ome.xml"), streaming=True)
+    assert len(opened) == 1
+
+
+def test_ensure_2016_closes_files(monkeypatch: pytest.MonkeyPatch) -> None:
+    path = str(DATA / "example.ome.xml")
+    opened: list[io.BufferedReader] = []
+    monkeypatch.setattr(
+        _conversion,
+        "open",
+        lambda *a: opened.append(open(*a)) or opened[-1],
+        raising=False,
+    )
+    # a path that needs no upgrade is returned as-is, not as an open file
+    assert _conversion.ensure_2016(path) == path
+    assert _conversion.ensure_2016(path, as_tree=True)
+    assert from_xml(path, streaming=True)
+    assert opened
+    assert all(fh.closed for fh in opened)
+
+
 def test_unknown_ns() -> None:
     with pytest.raises(ValueError, match="Unsupported document namespace"):
         from_xml('<Image xmlns="http://unknown.org" />')
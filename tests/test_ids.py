@@ -1,14 +1,29 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
 import pytest
 
 from ome_types import from_xml, model
 from ome_types._mixins import _ids
 from ome_types.model import Line, Rectangle
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def fresh_ids() -> Iterator[None]:
+    """Number IDs from scratch."""
+    with _ids.IdContext().active():
+        yield
 
-def test_no_id(monkeypatch: "pytest.MonkeyPatch") -> None:
-    """Test that ids are optional, and auto-increment."""
-    monkeypatch.setattr(_ids, "ID_COUNTER", {})
 
+@pytest.mark.usefixtures("fresh_ids")
+def test_no_id() -> None:
+    """Test that ids are optional, and auto-increment."""
     i = model.Instrument(id=20)  # type: ignore
     assert i.id == "Instrument:20"
     i2 = model.Instrument()  # type: ignore
@@ -19,17 +34,28 @@ def test_no_id(monkeypatch: "pytest.MonkeyPatch") -> None:
         model.Instrument(id="nonsense")
 
 
-def test_shape_ids(monkeypatch: "pytest.MonkeyPatch") -> None:
-    monkeypatch.setattr(_ids, "ID_COUNTER", {})
+@pytest.mark.usefixtures("fresh_ids")
+def test_valid_ids() -> None:
+    """Valid ids are kept as they are, and the counter skips past numbered ones."""
+    for id_ in ["Instrument:5", "Instrument:abc", "Instrument:2", "Instrument:1:2"]:
+        assert model.Instrument(id=id_).id == id_
+    assert model.Instrument().id == "Instrument:6"
+    lsid = "urn:lsid:example.org:Instrument:10"
+    assert model.Instrument(id=lsid).id == lsid
+    assert model.Instrument().id == "Instrument:11"
+
+
+@pytest.mark.usefixtures("fresh_ids")
+def test_shape_ids() -> None:
     rect = Rectangle(x=0, y=0, width=1, height=1)
     line = Line(x1=0, y1=0, x2=1, y2=1)
     assert rect.id == "Shape:0"
     assert line.id == "Shape:1"
 
 
-def test_id_conversion(monkeypatch: "pytest.MonkeyPatch") -> None:
+@pytest.mark.usefixtures("fresh_ids")
+def test_id_conversion() -> None:
     """When converting ids, we should still be preserving references."""
-    monkeypatch.setattr(_ids, "ID_COUNTER", {})
 
     XML_WITH_BAD_REFS = """<?xml version="1.0" ?>
     <OME xmlns="http://www.openmicroscopy.org/Schemas/OME/2016-06">
@@ -50,3 +76,59 @@ def test_id_conversion(monkeypatch: "pytest.MonkeyPatch") -> None:
     assert ome.images[0].instrument_ref is not None
     assert ome.images[0].instrument_ref.id == "Instrument:0"
     assert ome.images[0].instrument_ref.ref is ome.instruments[0]
+
+
+XML_WITH_BAD_IDS = """<?xml version="1.0" ?>
+<OME xmlns="http://www.openmicroscopy.org/Schemas/OME/2016-06">
+    <Instrument ID="Microscope"/>
+    <Instrument ID="Other"/>
+    <Image ID="Image:0">
+        <InstrumentRef ID="Other"/>
+        <Pixels DimensionOrder="XYCZT" SizeC="1" SizeT="1" SizeX="1" SizeY="1"
+            SizeZ="1" ID="Pixels:0" Type="uint8">
+            <MetadataOnly/>
+        </Pixels>
+    </Image>
+</OME>
+"""
+
+
+@pytest.mark.filterwarnings("ignore:Casting invalid")
+def test_ids_thread_safety() -> None:
+    """Documents can be parsed, and objects created, in several threads at once."""
+    barrier = threading.Barrier(8)
+
+    def parse(_: int) -> list[model.OME]:
+        barrier.wait()
+        return [from_xml(XML_WITH_BAD_IDS) for _ in range(20)]
+
+    def create(_: int) -> list[str]:
+        barrier.wait()
+        return [model.Experimenter().id for _ in range(500)]
+
+    with ThreadPoolExecutor(8) as executor:
+        parsed = [ome for omes in executor.map(parse, range(8)) for ome in omes]
+    for ome in parsed:
+        # invalid IDs are converted consistently within each document
+        first, other = ome.instruments
+        assert first.id != other.id
+        assert ome.images[0].instrument_ref is not None
+        assert ome.images[0].instrument_ref.ref is other
+
+    with ThreadPoolExecutor(8) as executor:
+        created = [id_ for ids in executor.map(create, range(8)) for id_ in ids]
+    assert len(set(created)) == len(created)
+
+
+@pytest.mark.usefixtures("fresh_ids")
+def test_id_scopes() -> None:
+    model.Instrument(id=5)
+    with _ids.id_scope():
+        # numbering continues from the enclosing context ...
+        assert model.Instrument().id == "Instrument:6"
+        with pytest.warns(match="Casting invalid"):
+            assert model.Instrument(id="bad").id == "Instrument:7"
+    # ... which continues after the scope, whose conversions are forgotten
+    assert model.Instrument().id == "Instrument:8"
+    with pytest.warns(match="Casting invalid"):
+        assert model.Instrument(id="bad").id == "Instrument:9"
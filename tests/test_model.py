@@ -3,13 +3,16 @@ from __future__ import annotations
 import copy
 import datetime
 import io
+import pickle
+import re
 import sys
+import uuid
 import warnings
 from pathlib import Path
 from typing import Any
 
 import pytest
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 from ome_types import from_tiff, from_xml, model, to_xml
 from ome_types.model import OME, AnnotationRef, CommentAnnotation, Instrument
@@ -45,6 +48,107 @@ def test_refs() -> None:
     assert ome.screens[0].plate_refs[0].ref is ome.plates[0]
 
 
+def test_id_index() -> None:
+    ome = from_xml(DATA / "two-screens-two-plates-four-wells.ome.xml")
+    assert ome.id_index["Plate:1"] is ome.plates[0]
+    assert ome.id_index["Screen:2"] is ome.screens[1]
+    well = ome.plates[0].wells[0]
+    assert ome.id_index[well.id] is well
+    assert ome.id_index[well.well_samples[0].id] is well.well_samples[0]
+    assert all(obj.id == id_ for id_, obj in ome.id_index.items())
+    with pytest.raises(TypeError):
+        ome.id_index["Plate:1"] = ome.plates[1]  # type: ignore[index]
+
+    # copies get their own index
+    for ome2 in (copy.deepcopy(ome), pickle.loads(pickle.dumps(ome))):
+        assert ome2.id_index["Plate:1"] is ome2.plates[0]
+    assert ome.model_copy().id_index["Plate:1"] is ome.plates[0]
+
+
+def test_referrers() -> None:
+    ome = from_xml(DATA / "two-screens-two-plates-four-wells.ome.xml")
+    plate = ome.plates[0]
+    assert ome.referrers(plate) == ome.referrers("Plate:1")
+    assert [(ref.ref, owner) for ref, owner in ome.referrers(plate)] == [
+        (plate, ome.screens[0]),
+        (plate, ome.screens[1]),
+    ]
+    assert ome.referrers(ome.plates[1])[0].reference is ome.screens[0].plate_refs[1]
+    sample = plate.wells[0].well_samples[0]
+    assert ome.referrers(sample.image_ref.id) == [(sample.image_ref, sample)]
+    assert ome.referrers(ome.screens[0]) == []
+    with pytest.raises(TypeError, match="no id"):
+        ome.referrers(model.TiffData())
+
+    for ome2 in (copy.deepcopy(ome), pickle.loads(pickle.dumps(ome))):
+        [(_, owner)] = ome2.referrers("Plate:2")
+        assert owner is ome2.screens[0]
+
+
+def test_incremental_links() -> None:
+    ome = OME(structured_annotations=[CommentAnnotation(id="Annotation:0", value="a")])
+    refs = [AnnotationRef(id="Annotation:0"), AnnotationRef(id="Annotation:1")]
+    image = model.Image(pixels=model.Pixels(**_PIXELS), annotation_refs=refs)
+    ome.images.append(image)
+    assert ome.id_index[image.id] is image
+    assert ome.id_index[image.pixels.id] is image.pixels
+    assert refs[0].ref is ome.structured_annotations[0]
+    with pytest.raises(ValueError, match="not yet resolved"):
+        refs[1].ref  # noqa: B018
+
+    # references are resolved when their target is added, and invalidated when
+    # it is removed
+    annotation = CommentAnnotation(id="Annotation:1", value="b")
+    ome.structured_annotations.append(annotation)
+    assert refs[1].ref is annotation
+    assert ome.referrers(annotation) == [(refs[1], image)]
+    ome.structured_annotations.remove(annotation)
+    assert "Annotation:1" not in ome.id_index
+    assert refs[1].ref is None
+
+    # changing ids
+    refs[1].id = "Annotation:0"
+    assert refs[1].ref is ome.structured_annotations[0]
+    assert ome.referrers("Annotation:0") == [(refs[0], image), (refs[1], image)]
+    image.id = "Image:new"
+    assert ome.id_index["Image:new"] is image
+    # references to a renamed target are dangling, until the id is used again
+    ome.structured_annotations[0].id = "Annotation:2"
+    assert refs[0].ref is None and refs[1].ref is None
+    ome.structured_annotations[0].id = "Annotation:0"
+    assert refs[0].ref is refs[1].ref is ome.structured_annotations[0]
+
+    image.annotation_refs = []
+    assert ome.referrers("Annotation:0") == []
+    ome.images[0] = model.Image(pixels=model.Pixels(**_PIXELS))
+    assert "Image:new" not in ome.id_index
+    assert ome.id_index[ome.images[0].id] is ome.images[0]
+
+    # copies maintain their own indices
+    ome2 = copy.deepcopy(ome)
+    ome2.images.clear()
+    assert ome2.id_index.keys() == {"Annotation:0"}
+    assert len(ome.id_index) == 3
+
+
+def test_incremental_links_shared_objects() -> None:
+    # objects shared by several models keep all their indices up to date
+    ome1 = OME(instruments=[Instrument(id=0)])
+    ome2 = OME(instruments=ome1.instruments)
+    instrument = ome1.instruments[0]
+    instrument.id = "Instrument:5"
+    for ome in (ome1, ome2):
+        assert dict(ome.id_index) == {"Instrument:5": instrument}
+
+    ome2.instruments.clear()
+    assert ome2.id_index == {}
+    instrument.id = "Instrument:6"
+    assert dict(ome1.id_index) == {"Instrument:6": instrument}
+    del ome2
+    instrument.id = "Instrument:7"
+    assert dict(ome1.id_index) == {"Instrument:7": instrument}
+
+
 def test_ref_copy() -> None:
     aref = AnnotationRef(id=1)
     ome = OME(
@@ -195,6 +299,105 @@ def test_numpy_pixel_types() -> None:
         numpy.dtype(m.numpy_dtype)
 
 
+def test_plane_table(valid_xml: Path) -> None:
+    pytest.importorskip("numpy")
+
+    ome = from_xml(valid_xml)
+    tabled = from_xml(valid_xml, plane_table=True)
+    assert to_xml(tabled) == to_xml(ome)
+    for image, tabled_image in zip(ome.images, tabled.images):
+        planes = image.pixels.planes
+        if any(p.hash_sha1 or p.annotation_refs for p in planes):
+            # can't be represented in a table: parsed as usual
+            assert tabled_image.pixels.planes == planes
+            continue
+        table = tabled_image.pixels.plane_table
+        assert not tabled_image.pixels.planes
+        assert table == image.pixels.plane_table
+        assert table.to_planes() == planes
+        tabled_image.pixels.plane_table = None
+        assert tabled_image.pixels.planes == planes
+
+
+def test_plane_locator() -> None:
+    np = pytest.importorskip("numpy")
+
+    file_a = model.TiffData.UUID(
+        value=f"urn:uuid:{uuid.uuid4()}", file_name="a.ome.tif"
+    )
+    file_b = model.TiffData.UUID(
+        value=f"urn:uuid:{uuid.uuid4()}", file_name="b.ome.tif"
+    )
+    pixels = model.Pixels(
+        size_x=1,
+        size_y=1,
+        size_z=2,
+        size_c=3,
+        size_t=2,
+        dimension_order="XYCZT",
+        type="uint8",
+        tiff_data_blocks=[
+            # t=0 in file a; t=1 in file b, starting at IFD 2
+            model.TiffData(uuid=file_a, plane_count=6),
+            model.TiffData(uuid=file_b, first_t=1, ifd=2, plane_count=6),
+            # IFD given without plane_count: a single plane, in this file
+            model.TiffData(first_z=1, first_t=1, ifd=9),
+        ],
+    )
+    locator = pixels.plane_locator()
+    assert locator[1, 2, 0] == (file_a, 5)
+    assert locator[0, 1, 1] == (file_b, 3)
+    assert locator[1, 0, 1] == (None, 9)
+    assert locator[1, 1, 1] == (file_b, 6)
+
+    files, ifds = locator.locate([[1, 2, 0], [0, 1, 1], [1, 0, 1]])
+    assert [locator.files[i] for i in files] == [file_a, file_b, None]
+    np.testing.assert_array_equal(ifds, [5, 3, 9])
+
+    pixels.tiff_data_blocks = pixels.tiff_data_blocks[:1]
+    locator = pixels.plane_locator()
+    with pytest.raises(KeyError):
+        locator[0, 0, 1]
+    assert locator.locate([0, 0, 1])[1].tolist() == [-1]
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "bzip2"])
+def test_bin_data_as_array(compression: str) -> None:
+    np = pytest.importorskip("numpy")
+    import bz2
+    import zlib
+
+    compress = {"none": bytes, "zlib": zlib.compress, "bzip2": bz2.compress}
+    data = np.arange(12, dtype=">u2").reshape(3, 4)
+    bin_data = model.BinData(
+        value=compress[compression](data.tobytes()),
+        compression=compression,
+        big_endian=True,
+        length=0,
+    )
+    np.testing.assert_array_equal(bin_data.as_array("uint16"), data.ravel())
+    np.testing.assert_array_equal(bin_data.as_array("uint16", (3, 4)), data)
+    out = np.empty((3, 4), "uint16")
+    assert bin_data.as_array("uint16", out=out) is out
+    np.testing.assert_array_equal(out, data)
+    with pytest.raises(ValueError):
+        bin_data.as_array("uint16", (2, 4), out=np.empty((2, 4), "uint16"))
+
+    mask = model.BinData(value=bytes([0b10110000]), big_endian=True, length=0)
+    assert mask.as_array(bool, 5).tolist() == [True, False, True, True, False]
+
+
+def test_pixels_bin_data_array() -> None:
+    np = pytest.importorskip("numpy")
+
+    pixels = from_xml(DATA / "z-series.ome.xml").images[0].pixels
+    array = pixels.bin_data_array()
+    # XYCTZ
+    assert array.shape == (5, 1, 1, 24, 18)
+    for plane, block in zip(array.reshape(-1, 24, 18), pixels.bin_data_blocks):
+        np.testing.assert_array_equal(plane.ravel(), np.frombuffer(block.value, "u1"))
+
+
 def test_xml_annotations_to_etree(with_xml_annotations: Path) -> None:
     from xsdata_pydantic_basemodel.compat import AnyElement
 
@@ -230,6 +433,108 @@ def test_update_unset(pixels: model.Pixels) -> None:
     assert from_xml(xml) == ome
 
 
+def _fields_sets(obj: Any) -> list[tuple[str, set[str]]]:
+    """Return the set fields of all models in obj, in order."""
+    if isinstance(obj, list):
+        return [s for item in obj for s in _fields_sets(item)]
+    if not isinstance(obj, BaseModel):
+        return []
+    out = [(type(obj).__name__, set(obj.model_fields_set))]
+    for name in type(obj).model_fields:
+        out.extend(_fields_sets(getattr(obj, name)))
+    return out
+
+
+def test_update_unset_tracking() -> None:
+    """Only examining changed objects gives the same result as examining all."""
+    from ome_types._pydantic_compat import update_set_fields
+
+    def add_image(ome: OME) -> None:
+        pixels = model.Pixels(**_PIXELS)
+        image = model.Image(pixels=pixels)
+        # changed before being added, after being added, and once serialized
+        pixels.channels.append(model.Channel())
+        ome.images.append(image)
+        image.pixels.planes.append(model.Plane(**_PLANE))
+
+    steps = [
+        lambda ome: None,
+        add_image,
+        lambda ome: ome.images[-1].pixels.channels.append(model.Channel()),
+        lambda ome: setattr(ome.images[-1].pixels.channels[0], "name", "x"),
+        lambda ome: ome.images[-1].pixels.tiff_data_blocks.extend([model.TiffData()]),
+        lambda ome: setattr(ome.images[0], "pixels", model.Pixels(**_PIXELS)),
+        lambda ome: ome.images[0].pixels.channels.insert(0, model.Channel()),
+        lambda ome: ome.structured_annotations.append(
+            model.CommentAnnotation(value="c")
+        ),
+        lambda ome: ome.images.append(ome.images[1].model_copy()),
+        lambda ome: ome.images[-1].pixels.planes.append(model.Plane(**_PLANE)),
+        lambda ome: ome.images[-1].pixels.channels.clear(),
+        lambda ome: ome.projects.append(model.Project()),
+    ]
+    tracked = from_xml(DATA / "example.ome.xml")
+    full = from_xml(DATA / "example.ome.xml")
+    for step in steps:
+        step(tracked)
+        step(full)
+        tracked._update_set_fields()
+        update_set_fields(full)
+        assert _fields_sets(tracked) == _fields_sets(full)
+        assert _xml_without_ids(tracked) == _xml_without_ids(full)
+
+    # copies are examined in full the first time
+    for copied in (copy.deepcopy(tracked), pickle.loads(pickle.dumps(tracked))):
+        copied.images[-1].pixels.channels.append(model.Channel(name="y"))
+        full.images[-1].pixels.channels.append(model.Channel(name="y"))
+        copied._update_set_fields()
+        update_set_fields(full)
+        assert _xml_without_ids(copied) == _xml_without_ids(full)
+        full.images[-1].pixels.channels.pop()
+
+
+def test_update_unset_tracking_removed() -> None:
+    """Objects forget the objects they are removed from."""
+    from ome_types._mixins._tracking import is_clean
+
+    ch = model.Channel()
+    all_pixels = [model.Pixels(**_PIXELS) for _ in range(50)]
+    for pixels in all_pixels:
+        pixels.channels.append(ch)
+        pixels._update_set_fields()
+        pixels.channels.remove(ch)
+        pixels._update_set_fields()
+    assert not ch._parents  # type: ignore[attr-defined]
+    ch.name = "x"
+    assert all(is_clean(pixels) for pixels in all_pixels)
+
+    # ... but not from the objects that still hold them
+    pixels = all_pixels[0]
+    pixels.channels.extend([ch, ch])
+    pixels._update_set_fields()
+    pixels.channels.pop()
+    pixels._update_set_fields()
+    ch.name = "y"
+    assert not is_clean(pixels)
+    image = model.Image(pixels=pixels)
+    image._update_set_fields()
+    image.pixels = model.Pixels(**_PIXELS)
+    image._update_set_fields()
+    assert not any(p() is image for p in pixels._parents)  # type: ignore[attr-defined]
+
+
+def _xml_without_ids(ome: OME) -> str:
+    # new objects are numbered from a global counter
+    return re.sub(r'ID="[^"]*"', "", to_xml(ome))
+
+
+_PIXELS = {
+    "size_c": 1, "size_t": 1, "size_z": 1, "size_x": 1, "size_y": 1,
+    "dimension_order": "XYZCT", "type": "uint8",
+}  # fmt: skip
+_PLANE = {"the_z": 0, "the_t": 0, "the_c": 0}
+
+
 @pytest.mark.filterwarnings("ignore::pytest.PytestUnraisableExceptionWarning")
 def test_transformations() -> None:
     from ome_types import etree_fixes
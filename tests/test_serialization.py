@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import gzip
+import io
 import json
 import pickle
 import re
@@ -11,7 +13,7 @@ from xml.etree import ElementTree as ET
 
 import pytest
 
-from ome_types import from_xml, to_dict, to_xml
+from ome_types import from_xml, to_dict, to_xml, write_xml
 from ome_types._conversion import OME_2016_06_NS, OME_2016_06_URI, OME_2016_06_XSD
 from ome_types.model import OME, Channel, Image, Pixels
 
@@ -167,6 +169,51 @@ def test_canonicalize() -> None:
     _ = to_xml(ome, validate=True, canonicalize=True)
 
 
+@pytest.mark.parametrize("indent", [0, 2])
+def test_canonicalize_output(valid_xml: Path, indent: int) -> None:
+    """Canonical output is C14N 2.0 (stripped text), pretty-printed by minidom."""
+    ome = from_xml(valid_xml)
+    if valid_xml.name == "example.ome.xml":
+        ome.images[0].name = "a\"b'c\n\t<&>\r  x"
+        ome.images[0].description = " a\"b'c\n\t<&>\r]]> x "
+    xml = to_xml(ome, indent=indent, include_namespace=True)
+    c14n = ET.canonicalize(xml, strip_text=True)
+    expected = minidom.parseString(c14n).toprettyxml(indent=" " * indent)
+    assert to_xml(ome, indent=indent, canonicalize=True) == expected
+
+
+def test_to_xml_dest(valid_xml: Path, tmp_path: Path) -> None:
+    ome = from_xml(valid_xml)
+    xml = to_xml(ome)
+
+    # the streaming writer gives the same output as rendering to a string
+    text = io.StringIO()
+    assert to_xml(ome, dest=text) is None
+    assert text.getvalue() == xml
+    binary = io.BytesIO()
+    write_xml(ome, binary)
+    assert binary.getvalue() == xml.encode()
+    assert not binary.closed
+
+    to_xml(ome, dest=tmp_path / "out.ome.xml", validate=True)
+    assert (tmp_path / "out.ome.xml").read_text(encoding="utf-8") == xml
+
+
+def test_to_xml_dest_gzip(tmp_path: Path) -> None:
+    ome = from_xml(DATA / "example.ome.xml")
+    xml = to_xml(ome, indent=0)
+    write_xml(ome, tmp_path / "out.ome.xml.gz", indent=0)
+    assert gzip.decompress((tmp_path / "out.ome.xml.gz").read_bytes()) == xml.encode()
+    binary = io.BytesIO()
+    write_xml(ome, binary, compression="gzip", indent=0)
+    assert gzip.decompress(binary.getvalue()) == xml.encode()
+
+    with pytest.raises(ValueError, match="compression requires"):
+        write_xml(ome, io.StringIO(), compression="gzip")
+    with pytest.raises(ValueError, match="validate=True requires"):
+        write_xml(ome, io.StringIO(), validate=True)
+
+
 def test_export_schema() -> None:
     schema = OME.model_json_schema()
     assert isinstance(schema, dict)
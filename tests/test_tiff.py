@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import io
+import threading
+import time
+import uuid
+from pathlib import Path
+from struct import calcsize, pack
+from typing import Any
+
+import pytest
+
+from ome_types import (
+    TiffSet,
+    _conversion,
+    _tiff,
+    from_tiff,
+    from_tiff_set,
+    from_tiffs,
+    from_xml,
+    model,
+    to_xml,
+    update_tiff_xml,
+)
+from ome_types._conversion import tiff2xml
+from ome_types._tiff import TiffHeader
+
+DATA = Path(__file__).parent / "data"
+OME_XML = (DATA / "example.ome.xml").read_bytes()
+
+
+def write_tiff(
+    path: Path,
+    descriptions: list[bytes | None],
+    *,
+    bigtiff: bool = False,
+    byteorder: str = "<",
+) -> Path:
+    """Write a TIFF with one IFD per description (holding only tags 256 and 270)."""
+    bo = byteorder
+    if bigtiff:
+        head = pack(f"{bo}2sHHHQ", b"II" if bo == "<" else b"MM", 43, 8, 0, 16)
+        count_fmt, entry_fmt, offset_fmt = f"{bo}Q", f"{bo}HHQQ", f"{bo}Q"
+    else:
+        head = pack(f"{bo}2sHI", b"II" if bo == "<" else b"MM", 42, 8)
+        count_fmt, entry_fmt, offset_fmt = f"{bo}H", f"{bo}HHII", f"{bo}I"
+    ifd_sizes = [
+        calcsize(count_fmt) + (2 if d is not None else 1) * calcsize(entry_fmt)
+        + calcsize(offset_fmt)
+        for d in descriptions
+    ]  # fmt: skip
+    # the descriptions are written after all the IFDs
+    ifds, values = [head], b""
+    value_at = len(head) + sum(ifd_sizes)
+    for i, desc in enumerate(descriptions):
+        tags = [pack(entry_fmt, 256, 4, 1, 1)]
+        if desc is not None:
+            offset = value_at + len(values)
+            values += desc + b"\0"
+            tags.append(pack(entry_fmt, 270, 2, len(desc) + 1, offset))
+        last = i + 1 == len(descriptions)
+        next_ifd = 0 if last else len(head) + sum(ifd_sizes[: i + 1])
+        ifds += [pack(count_fmt, len(tags)), *tags, pack(offset_fmt, next_ifd)]
+    path.write_bytes(b"".join(ifds) + values)
+    return path
+
+
+@pytest.mark.parametrize("bigtiff", [False, True])
+@pytest.mark.parametrize("byteorder", ["<", ">"])
+def test_tiff_header(tmp_path: Path, bigtiff: bool, byteorder: str) -> None:
+    descs = [b"not OME-XML", None, OME_XML]
+    path = write_tiff(tmp_path / "t.tif", descs, bigtiff=bigtiff, byteorder=byteorder)
+    for source in (path, path.read_bytes(), io.BytesIO(path.read_bytes())):
+        with TiffHeader(source) as tiff:
+            assert tiff.bigtiff is bigtiff
+            assert tiff.byteorder == byteorder
+            assert len(tiff.ifd_offsets) == 3
+            assert [tiff.description(i) for i in range(3)] == descs
+            assert tiff.tags(1)[256].value_count == 1
+            assert tiff.ome_xml() == OME_XML
+
+    # the OME-XML is found in a later IFD, or any IFD can be asked for
+    assert tiff2xml(path) == OME_XML
+    assert tiff2xml(path, ifd=0) == b"not OME-XML"
+    with pytest.raises(ValueError, match="No ImageDescription in IFD 1"):
+        tiff2xml(path, ifd=1)
+    assert from_tiff(path) == from_xml(OME_XML)
+
+    with open(path, "rb") as fh:
+        assert tiff2xml(fh) == OME_XML
+
+    # without OME-XML, the first ImageDescription is returned (if there is one)
+    write_tiff(path, [b"not OME-XML"], bigtiff=bigtiff, byteorder=byteorder)
+    assert tiff2xml(path) == b"not OME-XML"
+    write_tiff(path, [None, b"not OME-XML"], bigtiff=bigtiff, byteorder=byteorder)
+    with pytest.raises(ValueError, match="No OME metadata found"):
+        tiff2xml(path)
+
+
+class _UnmappableFile(io.RawIOBase):
+    """A file-like object without `fileno`, that counts the bytes read from it."""
+
+    def __init__(self, data: bytes) -> None:
+        self._fh = io.BytesIO(data)
+        self.nread = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._fh.seek(offset, whence)
+
+    def readinto(self, b: Any) -> int:
+        n = self._fh.readinto(b)
+        self.nread += n
+        return n
+
+
+def test_tiff_header_lazy(tmp_path: Path) -> None:
+    descs: list[bytes | None] = [OME_XML] + [None] * 2000
+    path = write_tiff(tmp_path / "t.tif", descs)
+    with TiffHeader(path) as tiff:
+        # the IFD chain is only followed as far as needed
+        assert tiff.ome_xml() == OME_XML
+        assert len(tiff._ifd_offsets) == 1
+        assert len(tiff.ifd_offsets) == 2001
+
+    # a file that can't be memory-mapped is not read in full
+    data = write_tiff(tmp_path / "t.tif", [OME_XML, *[None] * 10, b"x" * 100_000])
+    fh = _UnmappableFile(data.read_bytes())
+    assert tiff2xml(fh) == OME_XML
+    assert fh.nread < len(OME_XML) + 1000
+    with TiffHeader(fh) as tiff:
+        assert tiff.description(11) == b"x" * 100_000
+
+
+def test_tiff_header_missing_ifd(tmp_path: Path) -> None:
+    path = write_tiff(tmp_path / "t.tif", [b"not OME-XML"])
+    with pytest.raises(ValueError, match="No IFD 3"):
+        tiff2xml(path, ifd=3)
+    # a file whose first IFD offset is 0, or past the end of the file
+    for offset in (0, 1 << 20):
+        data = bytearray(path.read_bytes())
+        data[4:8] = pack("<I", offset)
+        with pytest.raises(ValueError, match="No IFD 0"):
+            tiff2xml(io.BytesIO(data))
+    # IFDs that form a cycle
+    data = bytearray(path.read_bytes())
+    next_at = 8 + 2 + 2 * 12
+    data[next_at : next_at + 4] = pack("<I", 8)
+    with TiffHeader(bytes(data)) as tiff:
+        assert tiff.ifd_offsets == [8]
+
+
+def test_tiff_header_invalid(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="does not have a recognized TIFF header"):
+        TiffHeader(b"not a tiff")
+    (tmp_path / "empty.tif").touch()
+    with pytest.raises(ValueError, match="does not have a recognized TIFF header"):
+        TiffHeader(tmp_path / "empty.tif")
+
+
+@pytest.mark.parametrize(
+    "executor, ordered", [("thread", True), ("thread", False), ("process", True)]
+)
+def test_from_tiffs(tmp_path: Path, executor: Any, ordered: bool) -> None:
+    paths: list[Path | str] = [
+        write_tiff(tmp_path / f"{i}.tif", [OME_XML]) for i in range(4)
+    ]
+    paths.insert(2, DATA / "ome.tiff")
+    paths.append(tmp_path / "missing.tif")
+
+    results = list(from_tiffs(paths, workers=2, executor=executor, ordered=ordered))
+    if not ordered:
+        results.sort(key=lambda r: paths.index(r.path))
+    assert [r.path for r in results] == paths
+    assert [r.ome for r in results[:5]] == [from_tiff(p) for p in paths[:5]]
+    # identical OME-XML is only parsed once
+    assert results[0].ome is results[1].ome is results[3].ome
+    assert results[2].ome is not results[0].ome
+    assert not any(r.error for r in results[:5])
+    assert results[5].ome is None
+    assert isinstance(results[5].error, FileNotFoundError)
+
+    with pytest.raises(ValueError, match="executor must be"):
+        next(from_tiffs(paths, executor="fiber"))  # type: ignore[arg-type]
+
+
+def test_from_tiffs_pipelining(monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[str] = []
+    lock = threading.Lock()
+
+    def _tiff2xml(path: str) -> bytes:
+        time.sleep(0.005)
+        with lock:
+            events.append("read")
+        return path.encode()
+
+    def _from_xml(xml: bytes, **kwargs: Any) -> bytes:
+        time.sleep(0.005)
+        with lock:
+            events.append("parsed")
+        return xml
+
+    monkeypatch.setattr(_conversion, "tiff2xml", _tiff2xml)
+    monkeypatch.setattr(_conversion, "from_xml", _from_xml)
+    paths = [str(i) for i in range(40)]
+    results = list(from_tiffs(paths, workers=2))
+    assert [r.ome for r in results] == [p.encode() for p in paths]
+    # parsing starts before all files are read, and at most 2 * workers
+    # documents wait to be parsed
+    assert events.index("parsed") < len(paths) - 1
+    waiting = [events[: i + 1].count("read") - events[: i + 1].count("parsed")
+               for i in range(len(events))]  # fmt: skip
+    assert max(waiting) <= 4
+
+
+def test_from_tiff_set(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    uuids = [uuid.uuid4().urn for _ in range(3)]
+    pixels = model.Pixels(
+        size_x=1, size_y=1, size_z=2, size_c=1, size_t=1, type="uint8",
+        dimension_order="XYZCT",
+        tiff_data_blocks=[
+            model.TiffData(
+                first_z=z, uuid=model.TiffData.UUID(value=u, file_name=f"{z}.ome.tif")
+            )
+            for z, u in enumerate(uuids[1:])
+        ],
+    )  # fmt: skip
+    ome = model.OME(uuid=uuids[0], images=[model.Image(pixels=pixels)])
+    companion = tmp_path / "set.companion.ome"
+    companion.write_text(to_xml(ome))
+    for u, name in zip(uuids[1:], ["0.ome.tif", "1.ome.tif"]):
+        binary_only = model.OME.BinaryOnly(metadata_file=companion.name, uuid=uuids[0])
+        xml = to_xml(model.OME(uuid=u, binary_only=binary_only)).encode()
+        write_tiff(tmp_path / name, [xml])
+
+    parsed = []
+
+    def _from_xml(source: Any, **kwargs: Any) -> model.OME:
+        parsed.append(source)
+        return from_xml(source, **kwargs)
+
+    monkeypatch.setattr(_conversion, "from_xml", _from_xml)
+    cache: dict[str, TiffSet] = {}
+    result = from_tiff_set(tmp_path / "0.ome.tif", cache=cache)
+    assert result.ome == ome
+    assert result.files == {
+        uuids[1]: (tmp_path / "0.ome.tif").resolve(),
+        uuids[2]: (tmp_path / "1.ome.tif").resolve(),
+    }
+    # the companion is only parsed once for the whole set
+    assert from_tiff_set(tmp_path / "1.ome.tif", cache=cache) is result
+    assert len(parsed) == 1
+    assert set(cache) == set(uuids)
+
+    # the full OME-XML can also be in one of the TIFFs
+    master = ome.model_copy(update={"uuid": uuids[1]})
+    write_tiff(tmp_path / "0.ome.tif", [to_xml(master).encode()])
+    binary_only = model.OME.BinaryOnly(metadata_file="0.ome.tif", uuid=uuids[1])
+    xml = to_xml(model.OME(uuid=uuids[2], binary_only=binary_only)).encode()
+    write_tiff(tmp_path / "1.ome.tif", [xml])
+    result = from_tiff_set(tmp_path / "1.ome.tif")
+    assert result.ome == master
+    assert result.files[uuids[1]] == tmp_path / "0.ome.tif"
+    assert from_tiff_set(DATA / "ome.tiff").ome == from_tiff(DATA / "ome.tiff")
+
+    # file names are relative to the metadata file, wherever it is
+    (tmp_path / "meta").mkdir()
+    for block in pixels.tiff_data_blocks:
+        assert block.uuid is not None
+        block.uuid.file_name = f"../{block.uuid.file_name}"
+    (tmp_path / "meta" / "set.companion.ome").write_text(to_xml(ome))
+    binary_only = model.OME.BinaryOnly(
+        metadata_file="meta/set.companion.ome", uuid=uuids[0]
+    )
+    xml = to_xml(model.OME(uuid=uuids[1], binary_only=binary_only)).encode()
+    write_tiff(tmp_path / "0.ome.tif", [xml])
+    result = from_tiff_set(tmp_path / "0.ome.tif")
+    assert {uuid: path.resolve() for uuid, path in result.files.items()} == {
+        uuids[1]: (tmp_path / "0.ome.tif").resolve(),
+        uuids[2]: (tmp_path / "1.ome.tif").resolve(),
+    }
+
+
+@pytest.mark.parametrize("bigtiff", [False, True])
+@pytest.mark.parametrize("byteorder", ["<", ">"])
+def test_update_tiff_xml(tmp_path: Path, bigtiff: bool, byteorder: str) -> None:
+    path = tmp_path / "t.tif"
+    write_tiff(path, [b"not OME-XML", OME_XML], bigtiff=bigtiff, byteorder=byteorder)
+    size = path.stat().st_size
+    ome = from_xml(OME_XML)
+
+    # shorter: written in place
+    ome.images[0].name = "short"
+    update_tiff_xml(path, ome)
+    assert path.stat().st_size == size
+    assert from_tiff(path) == ome
+    assert tiff2xml(path) == to_xml(ome).encode()
+
+    # longer: appended to the file
+    ome.images[0].name = "long" * 20_000
+    xml = to_xml(ome).encode()
+    update_tiff_xml(path, xml)
+    assert size < path.stat().st_size <= size + len(xml) + 8
+    assert tiff2xml(path) == xml
+    with TiffHeader(path) as tiff:
+        assert tiff.description(0) == b"not OME-XML"
+        assert tiff.tags(1)[270].value_offset % 4 == 0
+
+    # any IFD can be replaced, even with values that fit in the tag entry
+    update_tiff_xml(path, "abc", ifd=0)
+    assert tiff2xml(path, ifd=0) == b"abc"
+    assert tiff2xml(path) == xml
+    with pytest.raises(ValueError, match="No ImageDescription"):
+        update_tiff_xml(write_tiff(path, [None]), ome, ifd=0)
+
+
+class _WriteRecorder:
+    """Wraps a file, recording the (position, data) of every write to it."""
+
+    def __init__(self, fh: Any, writes: list[tuple[int, bytes]]) -> None:
+        self._fh = fh
+        self._writes = writes
+
+    def write(self, data: bytes) -> int:
+        self._writes.append((self._fh.tell(), data))
+        return self._fh.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fh, name)
+
+    def __enter__(self) -> _WriteRecorder:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._fh.close()
+
+
+@pytest.mark.parametrize("bigtiff", [False, True])
+def test_update_tiff_xml_interrupted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, bigtiff: bool
+) -> None:
+    path = write_tiff(tmp_path / "t.tif", [b"not OME-XML", OME_XML], bigtiff=bigtiff)
+    original = path.read_bytes()
+    writes: list[tuple[int, bytes]] = []
+    monkeypatch.setattr(
+        _tiff, "open", lambda *a: _WriteRecorder(open(*a), writes), raising=False
+    )
+    longer = OME_XML.replace(b"</OME>", b"<!--" + b"x" * 1000 + b"--></OME>")
+    update_tiff_xml(path, longer)
+    assert tiff2xml(path) == longer
+
+    # had it stopped after any write, the old or the new description is readable
+    for n in range(len(writes)):
+        buf = bytearray(original)
+        for pos, data in writes[:n]:
+            buf[pos : pos + len(data)] = data
+        with TiffHeader(bytes(buf)) as tiff:
+            assert tiff.description(1) in (OME_XML, longer)
@@ -3,7 +3,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from ome_types import OME, _conversion, from_xml
+from ome_types import OME, _conversion, from_xml, precompile_transforms
 
 pytest.importorskip("lxml")
 
@@ -20,3 +20,13 @@ def test_transform() -> None:
 
     with pytest.warns(match="Transformed source"):
         from_xml(DATA / "2008_instrument.ome.xml", warn_on_schema_update=True)
+
+
+def test_upgrade_chain() -> None:
+    chain = _conversion._upgrade_chain(f"{_conversion.OME_ROOT}/2008-09")
+    assert len(chain) == 8
+    assert chain[-1].name == "2015-01-to-2016-06.xsl"
+    assert not _conversion._upgrade_chain(_conversion.OME_2016_06_URI)
+
+    precompile_transforms()
+    assert _conversion._get_xslt.cache_info().currsize == len(_conversion.TRANSFORMS)
@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Callable
 
 import pytest
 
-from ome_types import _conversion, validate_xml
+from ome_types import _conversion, clear_schema_cache, validate_xml
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -49,3 +49,15 @@ def test_validation_anybackend(single_xml: Path) -> None:
 def test_validation_raises(invalid_xml: Path, backend: str) -> None:
     with pytest.raises(_conversion.ValidationError):
         VALIDATORS[backend](invalid_xml)
+
+
+@pytest.mark.parametrize("backend", VALIDATORS)
+def test_schema_cache(single_xml: Path, backend: str) -> None:
+    clear_schema_cache()
+    VALIDATORS[backend](single_xml)
+    assert len(_conversion._SCHEMA_CACHE) == 1
+    schema = next(iter(_conversion._SCHEMA_CACHE.values()))
+    VALIDATORS[backend](single_xml)
+    assert next(iter(_conversion._SCHEMA_CACHE.values())) is schema
+    clear_schema_cache()
+    assert not _conversion._SCHEMA_CACHE